@@ -2,6 +2,8 @@ import sys
 from typing import List
 import unittest
 
+from advent import captcha
+
 
 def count(nums: List[int]) -> int:
     nums = nums + [nums[0]]
@@ -13,7 +15,11 @@ def count(nums: List[int]) -> int:
 
 
 if __name__ == '__main__':
-    print(count([int(x) for x in sys.argv[1]]))
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            print(captcha.count_stream(captcha.read_chunks(f)))
+    else:
+        print(captcha.count_stream(captcha.read_chunks(sys.stdin.buffer)))
 
 
 class Tests011(unittest.TestCase):
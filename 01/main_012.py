@@ -1,7 +1,9 @@
-import sys
 from typing import List
 import unittest
 
+from advent import captcha
+from advent.loader import load
+
 
 def count(nums: List[int]) -> int:
     half = int(len(nums) / 2)
@@ -13,7 +15,8 @@ def count(nums: List[int]) -> int:
 
 
 if __name__ == '__main__':
-    print(count([int(x) for x in sys.argv[1]]))
+    with load() as inp:
+        print(captcha.halfway(captcha.digits(inp)))
 
 
 class Tests012(unittest.TestCase):
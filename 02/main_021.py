@@ -1,7 +1,9 @@
-import fileinput
 from typing import List
 import unittest
 
+from advent import spreadsheet
+from advent.loader import load
+
 
 def checksum(data: List[List[int]]) -> int:
     running_sum = 0
@@ -18,10 +20,8 @@ def parse(data_str: List[str]) -> List[List[int]]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line]
-    print(checksum(parse(lines)))
+    with load() as inp:
+        print(spreadsheet.checksum_stream(inp.lines()))
 
 
 class Tests021(unittest.TestCase):
@@ -1,16 +1,14 @@
-import fileinput
-import itertools
 from typing import List
 import unittest
 
+from advent import spreadsheet
+from advent.loader import load
+
 
 def checksum(data: List[List[int]]) -> int:
     running_sum = 0
     for line in data:
-        for first, second in itertools.permutations(line, 2):
-            if int(first / second) == (first / second):
-                running_sum += int(first / second)
-                break
+        running_sum += spreadsheet.row_quotient(line)
     return running_sum
 
 
@@ -22,10 +20,8 @@ def parse(data_str: List[str]) -> List[List[int]]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line]
-    print(checksum(parse(lines)))
+    with load() as inp:
+        print(spreadsheet.checksum_stream(inp.lines(), spreadsheet.row_quotient))
 
 
 class Tests022(unittest.TestCase):
@@ -1,7 +1,9 @@
-import fileinput
 from typing import Generator, List, Tuple
 import unittest
 
+from advent import spiral
+from advent.loader import load
+
 
 def neighbors(count: int) -> Generator[Tuple[int, List[int]], None, None]:
     """
@@ -57,19 +59,12 @@ def dist(idx: int) -> int:
 
     :return: the Manhattan distance
     """
-    dists = [-1] * (idx + 1)
-    for idx, ns in neighbors(idx):
-        if len(ns) == 0:
-            dists[idx] = 0
-        else:
-            dists[idx] = min(dists[x] for x in ns) + 1
-    return dists[idx]
+    return spiral.dist(idx)
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(dist(int(lines[0])))
 
 
@@ -95,6 +90,12 @@ class Tests031(unittest.TestCase):
             (16, [15, 5])
         ], ns)
 
+    def test_dist_matches_neighbors(self):
+        dists = [-1] * 5_001
+        for idx, ns in neighbors(5_000):
+            dists[idx] = 0 if len(ns) == 0 else min(dists[x] for x in ns) + 1
+        self.assertEqual(dists[1:], [dist(x) for x in range(1, 5_001)])
+
     def test_1(self):
         self.assertEqual(0, dist(1))
 
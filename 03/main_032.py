@@ -1,21 +1,14 @@
-import enum
-import fileinput
-from typing import Generator, Tuple
+import itertools
+from typing import Generator, List, Tuple
 import unittest
 
+from advent import spiral
+from advent.loader import load
 
-def coords() -> Generator[Tuple[int, Tuple[int, int]], None, None]:
-    class Direction(enum.Enum):
-        UP = 1
-        LEFT = 2
-        DOWN = 3
-        RIGHT = 4
-
-        def next(self):
-            return Direction((self.value % len(Direction)) + 1)
 
+def coords() -> Generator[Tuple[int, Tuple[int, int]], None, None]:
     idx = 1
-    direction = Direction.RIGHT
+    dx, dy = 1, 0
     side_len = 1
     curr_len = 0
     num_sides = 0
@@ -25,14 +18,8 @@ def coords() -> Generator[Tuple[int, Tuple[int, int]], None, None]:
         yield (idx, (curr_x, curr_y))
 
         idx += 1
-        if direction == Direction.LEFT:
-            curr_x -= 1
-        elif direction == Direction.UP:
-            curr_y += 1
-        elif direction == Direction.RIGHT:
-            curr_x += 1
-        elif direction == Direction.DOWN:
-            curr_y -= 1
+        curr_x += dx
+        curr_y += dy
 
         curr_len += 1
         if curr_len == side_len:
@@ -41,29 +28,73 @@ def coords() -> Generator[Tuple[int, Tuple[int, int]], None, None]:
             if num_sides == 2:
                 num_sides = 0
                 side_len += 1
-            direction = direction.next()
+            # turn anticlockwise
+            dx, dy = -dy, dx
+
+
+def _grow(grid: List[int], width: int) -> List[int]:
+    """
+    :param grid: a ``width`` by ``width`` grid, row by row
+
+    :return: a grid twice as wide with the old one copied into its centre
+    """
+    out = [0] * (4 * width * width)
+    offset = width // 2
+    for row in range(width):
+        start = (row + offset) * 2 * width + offset
+        out[start:start + width] = grid[row * width:(row + 1) * width]
+    return out
 
 
 def neighbor_sum() -> Generator[Tuple[int, int], None, None]:
     """
     Calculate the sum of all neighbors of the cell.
 
+    The values are kept in a square grid stored row by row in a flat list, with cell 1 in the
+    centre; the grid doubles in width whenever the spiral is about to reach its edge.  Each cell's
+    position in the list is found by stepping from the last one, so the eight neighbors are fixed
+    offsets from it.
+
     :return: the neighbor sum
     """
-    cache = {}
-    for curr_coords in coords():
-        if curr_coords[0] == 1:
-            total = 1
-        else:
-            total = 0
-            for x in [-1, 0, 1]:
-                for y in [-1, 0, 1]:
-                    if not (x == 0 and y == 0):
-                        key = (x + curr_coords[1][0], y + curr_coords[1][1])
-                        if key in cache:
-                            total += cache[key]
-        cache[curr_coords[1]] = total
-        yield (curr_coords[0], total)
+    width = 8
+    grid = [0] * (width * width)
+    pos = (width // 2) * width + width // 2
+    grid[pos] = 1
+    yield (1, 1)
+
+    idx = 1
+    direction = 0
+    side_len = 1
+    curr_len = 0
+    num_sides = 0
+    while True:
+        if curr_len == 0 and (side_len + 1) // 2 + 2 > width // 2:
+            # cells on a side of side_len reach (side_len + 1) // 2 from the centre, and their
+            # neighbors one further, which must stay inside the grid
+            row, col = divmod(pos, width)
+            grid = _grow(grid, width)
+            pos = (row + width // 2) * 2 * width + col + width // 2
+            width *= 2
+        # right, up, left and down, with y increasing upwards as the rows do
+        step = (1, width, -1, -width)[direction]
+
+        idx += 1
+        pos += step
+        total = (grid[pos - width - 1] + grid[pos - width] + grid[pos - width + 1] +
+                 grid[pos - 1] + grid[pos + 1] +
+                 grid[pos + width - 1] + grid[pos + width] + grid[pos + width + 1])
+        grid[pos] = total
+        yield (idx, total)
+
+        curr_len += 1
+        if curr_len == side_len:
+            curr_len = 0
+            num_sides += 1
+            if num_sides == 2:
+                num_sides = 0
+                side_len += 1
+            direction = (direction + 1) % 4
 
 
 def first_larger(num: int) -> int:
@@ -73,9 +104,8 @@ def first_larger(num: int) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(first_larger(int(lines[0])))
 
 
@@ -110,6 +140,26 @@ class Tests032(unittest.TestCase):
             (25, (2, -2))
         ], [next(cs) for _ in range(25)])
 
+    def test_coords_match_spiral(self):
+        cs = coords()
+        for _ in range(5_000):
+            idx, coord = next(cs)
+            self.assertEqual(coord, spiral.coordinate(idx))
+
+    def test_neighbor_sum_grows(self):
+        ns = neighbor_sum()
+        cache = {}
+        for idx, (x, y) in coords():
+            if idx > 2_000:
+                break
+            total = sum(cache.get((x + dx, y + dy), 0) for dx in [-1, 0, 1] for dy in [-1, 0, 1]) or 1
+            cache[(x, y)] = total
+            self.assertEqual((idx, total), next(ns))
+
+    def test_neighbor_sum_matches_accumulate(self):
+        self.assertEqual(list(itertools.islice(spiral.accumulate(), 5_000)),
+                         list(itertools.islice(neighbor_sum(), 5_000)))
+
     def test_neighbor_sum(self):
         ns = neighbor_sum()
         self.assertEqual(
@@ -1,27 +1,21 @@
-import fileinput
-from typing import List
+from typing import Iterable
 import unittest
 
+from advent.loader import load
+from advent.passphrase import no_duplicates, tally
+
 
 def is_valid(passphrase: str) -> bool:
-    seen = set([])
-    for word in passphrase.split():
-        if word not in seen:
-            seen.add(word)
-        else:
-            return False
-    return True
+    return no_duplicates(passphrase)
 
 
-def num_valid(passphrases: List[str]) -> int:
-    return len([x for x in passphrases if is_valid(x)])
+def num_valid(passphrases: Iterable[str]) -> int:
+    return sum(1 for x in passphrases if is_valid(x))
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
-    print(num_valid(lines))
+    with load() as inp:
+        print(tally(inp, no_duplicates)[0])
 
 
 class Tests041(unittest.TestCase):
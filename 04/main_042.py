@@ -1,36 +1,21 @@
-from collections import defaultdict
-import fileinput
-from typing import Dict, List, Set, Tuple
+from typing import Iterable
 import unittest
 
-
-def build_key(passphrase: str) -> Tuple[Tuple[str, int]]:
-    counts = defaultdict(lambda: 0)  # type: Dict[str, int]
-    for letter in passphrase:
-        counts[letter] += 1
-    return tuple(sorted(dict(counts).items()))
+from advent.loader import load
+from advent.passphrase import no_anagrams, tally
 
 
 def is_valid(passphrase: str) -> bool:
-    seen = set([])  # type: Set[Dict[str, int]]
-    for word in passphrase.split():
-        key = build_key(word)
-        if key not in seen:
-            seen.add(key)
-        else:
-            return False
-    return True
+    return no_anagrams(passphrase)
 
 
-def num_valid(passphrases: List[str]) -> int:
-    return len([x for x in passphrases if is_valid(x)])
+def num_valid(passphrases: Iterable[str]) -> int:
+    return sum(1 for x in passphrases if is_valid(x))
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
-    print(num_valid(lines))
+    with load() as inp:
+        print(tally(inp, no_anagrams)[0])
 
 
 class Tests042(unittest.TestCase):
@@ -1,23 +1,20 @@
-import fileinput
 from typing import List
 import unittest
 
+from advent.loader import load
+from advent.maze import Maze
+
 
 def do_jumps(jumps: List[int]) -> int:
-    count = 0
-    i = 0
-    while i < len(jumps):
-        dist = jumps[i]
-        jumps[i] += 1
-        i += dist
-        count += 1
+    maze = Maze(jumps)
+    count = maze.run()
+    jumps[:] = maze.offsets
     return count
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(do_jumps([int(x) for x in lines]))
 
 
@@ -1,41 +1,21 @@
-import fileinput
 from typing import List
 import unittest
 
+from advent.banks import find_loop, redistribute
+from advent.loader import load
 
-def single_rebalance(cells: List[int]) -> List[int]:
-    idx = -max(zip(cells, [-x for x in range(len(cells))]))[1]
-
-    remaining = cells[idx]
-    cells[idx] = 0
-    while remaining > 0:
-        idx += 1
-        if idx == len(cells):
-            idx = 0
-        cells[idx] += 1
-        remaining -= 1
 
-    return cells
+def single_rebalance(cells: List[int]) -> List[int]:
+    return redistribute(cells)
 
 
 def rebalance(cells: List[int]) -> int:
-    seen = set([])
-    is_first = True
-    num_ops = 0
-    while is_first or tuple(cells) not in seen:
-        seen.add(tuple(cells))
-
-        cells = single_rebalance(cells)
-
-        num_ops += 1
-        is_first = False
-    return num_ops
+    return find_loop(cells)[0]
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(rebalance([int(x) for x in lines[0].split()]))
 
 
@@ -1,7 +1,8 @@
-import fileinput
 from typing import Dict, List
 import unittest
 
+from advent.loader import load
+
 
 class RawProgram(object):
     def __init__(self, name: str, weight: int, above: List[str]):
@@ -76,9 +77,8 @@ def build_tree(programs: Dict[str, RawProgram]) -> Program:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(build_tree(parse_all(lines)).name)
 
 
@@ -1,8 +1,9 @@
 from collections import defaultdict
-import fileinput
 from typing import Dict, List, Tuple
 import unittest
 
+from advent.loader import load
+
 
 class RawProgram(object):
     def __init__(self, name: str, weight: int, above: List[str]):
@@ -122,9 +123,8 @@ def main(lines: List[str]) -> Tuple[str, int]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(main(lines))
 
 
@@ -1,8 +1,9 @@
 from collections import defaultdict
-import fileinput
 from typing import Dict, List
 import unittest
 
+from advent.loader import load
+
 
 class Condition(object):
     lt = lambda a, b: a < b
@@ -97,9 +98,8 @@ def execute(cmds: List[Command]) -> Dict[str, int]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(max(execute(parse(lines)).values()))
 
 
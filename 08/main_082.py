@@ -1,8 +1,9 @@
 from collections import defaultdict
-import fileinput
 from typing import Dict, List, Tuple
 import unittest
 
+from advent.loader import load
+
 
 class Condition(object):
     lt = lambda a, b: a < b
@@ -99,9 +100,8 @@ def execute(cmds: List[Command]) -> Tuple[Dict[str, int], int]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(execute(parse(lines))[1])
 
 
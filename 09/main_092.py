@@ -1,7 +1,8 @@
-import fileinput
 from typing import Dict, List, Tuple
 import unittest
 
+from advent.loader import load
+
 
 class Stack(object):
     def __init__(self):
@@ -48,10 +49,8 @@ def parse(stream: str) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
-    print(parse(lines[0]))
+    with load() as inp:
+        print(parse(inp.text().strip()))
 
 
 class Tests092(unittest.TestCase):
@@ -1,7 +1,8 @@
-import fileinput
 from typing import Dict, List, Tuple
 import unittest
 
+from advent.loader import load
+
 
 def next_pos(start: int, length: int, skip: int, arr: List[int]) -> Tuple[int, int]:
     next = (start + length + skip) % len(arr)
@@ -30,9 +31,8 @@ def process(lengths: List[int], arr: List[int] = [x for x in range(256)]) -> int
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(process([int(x) for x in lines[0].split(',')]))
 
 
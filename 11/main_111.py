@@ -1,7 +1,8 @@
-import fileinput
-from typing import List, Tuple
+from typing import Iterable, Tuple
 import unittest
 
+from advent.loader import load
+
 
 N = (0, 1, -1)
 NE = (1, 0, -1)
@@ -15,7 +16,7 @@ def move(curr: Tuple[int, int, int], amt: Tuple[int, int, int]) -> Tuple[int, in
     return curr[0] + amt[0], curr[1] + amt[1], curr[2] + amt[2]
 
 
-def get_coords(path: List[str]) -> Tuple[int, int, int]:
+def get_coords(path: Iterable[str]) -> Tuple[int, int, int]:
     coords = (0, 0, 0)
     for step in path:
         if step == 'n':
@@ -35,15 +36,13 @@ def get_coords(path: List[str]) -> Tuple[int, int, int]:
     return coords
 
 
-def num_steps(path: List[str]) -> int:
+def num_steps(path: Iterable[str]) -> int:
     return max(abs(x) for x in get_coords(path))
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
-    print(num_steps(lines[0].split(',')))
+    with load() as inp:
+        print(num_steps(inp.tokens()))
 
 
 class Tests111(unittest.TestCase):
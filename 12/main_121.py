@@ -1,8 +1,9 @@
 from collections import deque
-import fileinput
 from typing import Dict, List, Set
 import unittest
 
+from advent.loader import load
+
 
 def parse_input(lines: List[str]) -> Dict[int, List[int]]:
     out = {}  # type: Dict[int, List[int]]
@@ -27,9 +28,8 @@ def visit_nodes(edges: Dict[int, List[int]], start: int) -> Set[int]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(len(visit_nodes(parse_input(lines), 0)))
 
 
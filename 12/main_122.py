@@ -1,8 +1,9 @@
 from collections import deque
-import fileinput
 from typing import Dict, List, Set
 import unittest
 
+from advent.loader import load
+
 
 def parse_input(lines: List[str]) -> Dict[int, List[int]]:
     out = {}  # type: Dict[int, List[int]]
@@ -34,9 +35,8 @@ def count_groups(edges: Dict[int, List[int]]) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(count_groups(parse_input(lines)))
 
 
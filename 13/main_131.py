@@ -1,7 +1,8 @@
-import fileinput
 from typing import List
 import unittest
 
+from advent.loader import load
+
 
 class Firewall(object):
     def __init__(self, depth: int, range: int):
@@ -74,9 +75,8 @@ def simulate(firewalls: List[Firewall]) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(simulate(parse(lines)))
 
 
@@ -1,9 +1,9 @@
 from collections import deque
-import fileinput
 from typing import List, Tuple, Set
 import unittest
 
-from main_102 import hash
+from advent.knot import hash_many
+from advent.loader import load
 
 
 def to_bin(hex: str) -> str:
@@ -28,10 +28,14 @@ def to_bin(hex: str) -> str:
     return ''.join(lookup[x] for x in hex)
 
 
-def build_map(key: str) -> List[List[bool]]:
+def build_map(key: str, rows: int=128, jobs: int=1) -> List[List[bool]]:
+    """
+    :param key: the key string the row keys are built from
+    :param rows: the number of rows in the grid
+    :param jobs: the number of processes to hash the rows across, as in :func:`advent.knot.hash_many`
+    """
     out = []  # type: List[List[bool]]
-    for i in range(128):
-        h = hash('{}-{}'.format(key, i))
+    for h in hash_many(['{}-{}'.format(key, i) for i in range(rows)], jobs):
         b = to_bin(h)
         out += [[x == '1' for x in b]]
     return out
@@ -72,9 +76,8 @@ def count_regions(used_map: List[List[bool]]) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(count_regions(build_map(lines[0])))
 
 
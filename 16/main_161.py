@@ -1,8 +1,9 @@
 import abc
-import fileinput
 from typing import List
 import unittest
 
+from advent.loader import load
+
 
 class Operation(metaclass=abc.ABCMeta):
     @abc.abstractmethod
@@ -115,10 +116,8 @@ def execute(ops: List[Operation], init: str='abcdefghijklmnop') -> str:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
-    print(execute(parse(lines[0])))
+    with load() as inp:
+        print(execute([parse_single(x) for x in inp.tokens()]))
 
 
 class Tests161(unittest.TestCase):
@@ -1,11 +1,12 @@
 import abc
-import fileinput
 import logging
 from typing import List
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -131,15 +132,14 @@ def execute_all(ops: List[Operation], init: str='abcdefghijklmnop') -> str:
         values += [curr]
         is_first = False
 
-    logger.info('Found loop after {} iterations'.format(period))
+    logger.info('Found loop after %s iterations', period)
     return values[1_000_000_000 % period]
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
-    print(execute_all(parse(lines[0])))
+    logs.configure()
+    with load() as inp:
+        print(execute_all([parse_single(x) for x in inp.tokens()]))
 
 
 class Tests162(unittest.TestCase):
@@ -1,7 +1,8 @@
-import fileinput
 from typing import List, Tuple
 import unittest
 
+from advent.loader import load
+
 
 def spinlock(rotate: int, iterations: int) -> Tuple[List[int], int]:
     buffer = [0]
@@ -20,9 +21,8 @@ def get_next(data: Tuple[List[int], int]) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    with load() as inp:
+        lines = list(inp.lines())
     print(get_next(spinlock(int(lines[0]), 2017)))
 
 
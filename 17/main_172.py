@@ -1,10 +1,11 @@
-import fileinput
 import logging
 from typing import List
 import unittest
 
+from advent import instrument, logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -13,25 +14,24 @@ def spinlock(rotate: int, iterations: int) -> int:
     next_val = 0
     length = 1
     curr = 0
-    for i in range(iterations):
-        if i % 500_000 == 0:
-            logging.info('Iteration {}'.format(i))
-
+    new_values = instrument.counter('spinlock.new_values_after_zero')
+    zero_moves = instrument.counter('spinlock.zero_moves')
+    for i in instrument.progress(range(iterations), 'spinlock', 500_000, iterations):
         curr = (curr + rotate) % length + 1
         if (curr - 1) == zero_loc:
             next_val = i + 1
-            logging.info('Iteration {}: Got new value after zero: {}'.format(i, next_val))
+            new_values.inc()
         elif curr == zero_loc:
             zero_loc += 1
-            logging.info('Iteration {}: Zero value moved to: {}'.format(i, zero_loc))
+            zero_moves.inc()
         length += 1
     return next_val
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.strip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(spinlock(int(lines[0]), 50_000_000))
 
 
@@ -1,10 +1,11 @@
-import fileinput
 import logging
 from typing import List
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -13,7 +14,7 @@ def find_start(first_line: str) -> int:
 
 
 def traverse(cells: List[str], start_x: int, start_y: int) -> str:
-    logger.info('Starting at ({}, {})'.format(start_x, start_y))
+    logger.info('Starting at (%s, %s)', start_x, start_y)
 
     curr_x = start_x
     curr_y = start_y
@@ -28,21 +29,21 @@ def traverse(cells: List[str], start_x: int, start_y: int) -> str:
             if delta_x == 0:
                 delta_y = 0
                 if curr_x + 1 < len(cells[curr_y]) and cells[curr_y][curr_x + 1] != ' ':
-                    logger.info('Turning right at ({}, {})'.format(curr_x, curr_y))
+                    logger.info('Turning right at (%s, %s)', curr_x, curr_y)
                     delta_x = 1
                 else:
-                    logger.info('Turning left at ({}, {})'.format(curr_x, curr_y))
+                    logger.info('Turning left at (%s, %s)', curr_x, curr_y)
                     delta_x = -1
             else:
                 delta_x = 0
                 if curr_y + 1 < len(cells) and curr_x < len(cells[curr_y + 1]) and cells[curr_y + 1][curr_x] != ' ':
-                    logger.info('Turning up at ({}, {})'.format(curr_x, curr_y))
+                    logger.info('Turning up at (%s, %s)', curr_x, curr_y)
                     delta_y = 1
                 else:
-                    logger.info('Turning down at ({}, {})'.format(curr_x, curr_y))
+                    logger.info('Turning down at (%s, %s)', curr_x, curr_y)
                     delta_y = -1
         elif 'A' <= curr_cell <= 'Z':
-            logger.info('Found "{}" at ({}, {})'.format(curr_cell, curr_x, curr_y))
+            logger.info('Found "%s" at (%s, %s)', curr_cell, curr_x, curr_y)
             found += curr_cell
 
         curr_x += delta_x
@@ -53,9 +54,9 @@ def traverse(cells: List[str], start_x: int, start_y: int) -> str:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(traverse(lines, find_start(lines[0]), 0))
 
 
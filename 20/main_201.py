@@ -1,11 +1,12 @@
-import fileinput
 import logging
 import re
 from typing import Dict, List
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -58,9 +59,9 @@ def find_min(particles: Dict[int, Particle]) -> int:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(find_min(parse(lines)))
 
 
@@ -1,13 +1,14 @@
 from collections import defaultdict
-import datetime
-import fileinput
+import itertools
 import logging
 import re
 from typing import Dict, List, Set, Tuple
 import unittest
 
+from advent import instrument, logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -101,38 +102,26 @@ def find_collisions(particles: Dict[int, Particle]) -> List[int]:
 def collide(particles: Dict[int, Particle]) -> int:
     x_order, y_order, z_order = get_final_orders(particles)
 
-    iteration = 0
-    start_time = datetime.datetime.now()
-    chunk_start_time = start_time
-    while not is_in_order(particles, x_order, y_order, z_order):
+    destroyed = instrument.counter('collide.destroyed')
+    for _ in instrument.progress(itertools.count(), 'collide', 1000):
+        if is_in_order(particles, x_order, y_order, z_order):
+            break
+
         for particle in particles.values():
             particle.step()
 
         collisions = find_collisions(particles)
-        if len(collisions) > 0:
-            logger.info('Found {} collisions in iteration {}'.format(len(collisions), iteration))
-            for i in collisions:
-                del particles[i]
-
-        iteration += 1
-
-        if iteration % 1000 == 0:
-            next_start_time = datetime.datetime.now()
-            logger.info('Iteration {}, {} particles remaining ({} elapsed, {} last chunk)'.format(
-                iteration,
-                len(particles),
-                next_start_time - start_time,
-                next_start_time - chunk_start_time
-            ))
-            chunk_start_time = next_start_time
+        destroyed.inc(len(collisions))
+        for i in collisions:
+            del particles[i]
 
     return len(particles)
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(collide(parse(lines)))
 
 
@@ -1,10 +1,11 @@
-import fileinput
 import logging
 from typing import List, Tuple
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -107,7 +108,8 @@ class Enhancements(object):
                 for rule in rules:
                     rewrite = rule.try_match(chunks[y][x])
                     if rewrite is not None:
-                        logger.info('Using rewrite:\n{}'.format(to_str(rewrite)))
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info('Using rewrite:\n%s', to_str(rewrite))
                         row_chunks += [rewrite]
                         break
                 else:
@@ -153,18 +155,21 @@ def main(lines: List[str], iterations: int=5) -> int:
     rules = parse(lines)
 
     grid = pattern
-    logger.info('Starting grid:\n{}'.format(to_str(grid)))
+    trace = logger.isEnabledFor(logging.INFO)
+    if trace:
+        logger.info('Starting grid:\n%s', to_str(grid))
     for i in range(iterations):
         grid = rules.apply(grid)
-        logger.info('Iteration {}:\n{}'.format(i + 1, to_str(grid)))
+        if trace:
+            logger.info('Iteration %s:\n%s', i + 1, to_str(grid))
 
     return len([x for x in flatten(grid) if x])
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(main(lines))
 
 
@@ -1,11 +1,11 @@
-import datetime
-import fileinput
 import logging
 from typing import List
 import unittest
 
+from advent import instrument, logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -108,7 +108,8 @@ class Enhancements(object):
                 for rule in rules:
                     rewrite = rule.try_match(chunks[y][x])
                     if rewrite is not None:
-                        logger.debug('Using rewrite:\n{}'.format(to_str(rewrite)))
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug('Using rewrite:\n%s', to_str(rewrite))
                         row_chunks += [rewrite]
                         break
                 else:
@@ -154,26 +155,23 @@ def main(lines: List[str], iterations: int=18) -> int:
     rules = parse(lines)
 
     grid = pattern
-    logger.info('Starting grid:\n{}'.format(to_str(grid)))
-    start_time = datetime.datetime.now()
-    for i in range(iterations):
-        iter_start_time = datetime.datetime.now()
-
-        grid = rules.apply(grid)
-
-        end_time = datetime.datetime.now()
-        logger.info('Iteration {} ({} elapsed, {} iteration)'.format(i + 1,
-                                                                     end_time - start_time,
-                                                                     end_time - iter_start_time))
-        logger.debug('\n{}'.format(to_str(grid)))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info('Starting grid:\n%s', to_str(grid))
+    iteration_timer = instrument.timer('enhance.iteration')
+    trace = logger.isEnabledFor(logging.DEBUG)
+    for _ in instrument.progress(range(iterations), 'enhance', 1, iterations):
+        with iteration_timer:
+            grid = rules.apply(grid)
+        if trace:
+            logger.debug('\n%s', to_str(grid))
 
     return len([x for x in flatten(grid) if x])
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(main(lines))
 
 
@@ -1,12 +1,13 @@
 from collections import defaultdict
-import fileinput
 import logging
 import math
 from typing import List, Set, Tuple
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -46,9 +47,9 @@ def parse(lines: List[str]) -> Set[Tuple[int, int]]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(infect(parse(lines))[2])
 
 
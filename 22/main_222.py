@@ -1,13 +1,14 @@
 from collections import defaultdict
 from enum import Enum
-import fileinput
 import logging
 import math
 from typing import Dict, List, Tuple
 import unittest
 
+from advent import instrument, logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -24,10 +25,7 @@ def infect(grid: Dict[Tuple[int, int], State], steps: int=10000000) -> Tuple[Dic
     curr_x = 0
     curr_y = 0
     dir = math.pi / 2
-    for i in range(steps):
-        if (i + 1) % 100_000 == 0:
-            logger.info('Iteration {}'.format(i + 1))
-
+    for _ in instrument.progress(range(steps), 'infect', 100_000, steps):
         curr = grid[(curr_x, curr_y)]
         if curr == State.CLEAN:
             dir = (dir + math.pi / 2) % (2 * math.pi)
@@ -67,9 +65,9 @@ def parse(lines: List[str]) -> Dict[Tuple[int, int], State]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(infect(parse(lines))[2])
 
 
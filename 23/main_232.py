@@ -1,8 +1,9 @@
 import logging
 import unittest
 
+from advent import logs
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +23,7 @@ def run(debug: bool) -> int:
 
 
 if __name__ == '__main__':
+    logs.configure()
     print(run(True))
 
 
@@ -1,10 +1,11 @@
-import fileinput
 import logging
 from typing import Dict, List, Set, Tuple
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +21,7 @@ def build(pieces: Dict[int, Set[Tuple[int, int]]]) -> Tuple[List[Tuple[int, int]
         next = pieces[connect]
         if all(x in used for x in next):
             strength = sum(flatten(bridge))
-            logger.debug('Found bridge ({}): {}'.format(strength, bridge))
+            logger.debug('Found bridge (%s): %s', strength, bridge)
             return bridge, strength
         else:
             best = None
@@ -54,9 +55,9 @@ def parse(lines: List[str]) -> Dict[int, Set[Tuple[int, int]]]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(build(parse(lines))[1])
 
 
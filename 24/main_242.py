@@ -1,10 +1,11 @@
-import fileinput
 import logging
 from typing import Dict, List, Set, Tuple
 import unittest
 
+from advent import logs
+from advent.loader import load
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +22,7 @@ def build(pieces: Dict[int, Set[Tuple[int, int]]]) -> Tuple[List[Tuple[int, int]
         if all(x in used for x in next):
             length = len(bridge)
             strength = sum(flatten(bridge))
-            logger.debug('Found bridge ({}): {}'.format(strength, bridge))
+            logger.debug('Found bridge (%s): %s', strength, bridge)
             return bridge, (length, strength)
         else:
             best = None  # type: Tuple[List[Tuple[int, int]], Tuple[int, int]]
@@ -55,9 +56,9 @@ def parse(lines: List[str]) -> Dict[int, Set[Tuple[int, int]]]:
 
 
 if __name__ == '__main__':
-    lines = []
-    for line in fileinput.input():
-        lines += [line.rstrip()]
+    logs.configure()
+    with load() as inp:
+        lines = list(inp.lines())
     print(build(parse(lines)))
 
 
@@ -3,8 +3,9 @@ import logging
 from typing import List
 import unittest
 
+from advent import instrument, logs
+
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -80,14 +81,12 @@ class Machine(object):
 
 
 def run(machine: Machine, iterations: int) -> int:
-    for _ in range(iterations):
-        if (_ + 1) % 1_000_000 == 0:
-            logger.info('Iteration {} of {}'.format(_ + 1, iterations))
+    for _ in instrument.progress(range(iterations), 'turing', 1_000_000, iterations):
         machine.step()
     return machine.num_ones()
 
 
-if __name__ == '__main__':
+def build() -> State:
     a = State('a')
     b = State('b')
     c = State('c')
@@ -106,7 +105,12 @@ if __name__ == '__main__':
     e.add_edge(Edge(1, 1, Direction.RIGHT, a))
     f.add_edge(Edge(0, 1, Direction.RIGHT, a))
     f.add_edge(Edge(1, 1, Direction.RIGHT, e))
-    print(run(Machine(a), 12_134_527))
+    return a
+
+
+if __name__ == '__main__':
+    logs.configure()
+    print(run(Machine(build()), 12_134_527))
 
 
 class Tests251(unittest.TestCase):
@@ -0,0 +1,8 @@
+"""
+Shared tooling for running, timing and benchmarking the daily solutions.
+
+Modules in this package are run from the repository root, e.g. ``python -m advent.runner``.  The
+day scripts import from it too, so run them from the root with the root on the path::
+
+    PYTHONPATH=. python 09/main_091.py 09/input.txt
+"""
@@ -0,0 +1,129 @@
+"""
+Memory bank reallocation (day 6) for banks holding millions of blocks.
+
+:func:`redistribute` hands out the fullest bank's blocks in one step: each bank gets the quotient of
+the blocks by the number of banks, and the remainder goes one each to the banks after the emptied
+one, so a cycle takes O(banks) however many blocks there are.  From :data:`NUMPY_BANKS` banks on,
+:func:`find_loop` holds the banks in a NumPy array, updates them with whole-array operations and
+remembers each configuration by its raw bytes.
+"""
+import random
+from typing import Dict, List, Sequence, Tuple
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+NUMPY_BANKS = 10_000
+
+
+def redistribute(cells: Sequence[int]) -> Sequence[int]:
+    """
+    Empty the fullest bank, the first of them if tied, handing its blocks out one at a time to the
+    banks after it in turn, wrapping around.
+
+    :param cells: the blocks in each bank, as a list or a NumPy array, which is updated in place
+
+    :return: ``cells``
+    """
+    n = len(cells)
+    if np is not None and isinstance(cells, np.ndarray):
+        idx = int(cells.argmax())
+    else:
+        idx = cells.index(max(cells))
+    quotient, remainder = divmod(int(cells[idx]), n)
+    cells[idx] = 0
+    end = idx + 1 + remainder
+    if np is not None and isinstance(cells, np.ndarray):
+        if quotient > 0:
+            cells += quotient
+        cells[idx + 1:end] += 1
+        cells[:max(end - n, 0)] += 1
+        return cells
+
+    if quotient > 0:
+        for i in range(n):
+            cells[i] += quotient
+    for i in range(idx + 1, min(end, n)):
+        cells[i] += 1
+    for i in range(end - n):
+        cells[i] += 1
+    return cells
+
+
+def find_loop(cells: List[int], numpy_banks: int=NUMPY_BANKS) -> Tuple[int, int]:
+    """
+    Redistribute until a configuration of the banks repeats.
+
+    :param cells: the blocks in each bank; this list is not changed
+    :param numpy_banks: the number of banks from which they are held in a NumPy array, if installed
+
+    :return: the number of cycles until the first repeat, and the number of cycles between the two
+        occurrences of the repeated configuration
+    """
+    if np is not None and len(cells) >= numpy_banks:
+        banks = np.array(cells, dtype=np.int64)
+        key = banks.tobytes
+    else:
+        banks = list(cells)
+        key = lambda: tuple(banks)
+    seen = {}  # type: Dict[object, int]
+    cycles = 0
+    while True:
+        state = key()
+        if state in seen:
+            return cycles, cycles - seen[state]
+        seen[state] = cycles
+        redistribute(banks)
+        cycles += 1
+
+
+class TestsBanks(unittest.TestCase):
+    def _reference(self, cells: List[int]) -> List[int]:
+        idx = -max(zip(cells, [-x for x in range(len(cells))]))[1]
+        remaining = cells[idx]
+        cells[idx] = 0
+        while remaining > 0:
+            idx = (idx + 1) % len(cells)
+            cells[idx] += 1
+            remaining -= 1
+        return cells
+
+    def test_redistribute(self):
+        self.assertEqual([2, 4, 1, 2], redistribute([0, 2, 7, 0]))
+        self.assertEqual([3, 1, 2, 3], redistribute([2, 4, 1, 2]))
+        self.assertEqual([1, 3, 4, 1], redistribute([0, 2, 3, 4]))
+
+    def test_redistribute_matches_reference(self):
+        rng = random.Random(0)
+        for n in [1, 2, 5, 17]:
+            for max_value in [3, 50, 1_000]:
+                cells = [rng.randint(0, max_value) for _ in range(n)]
+                self.assertEqual(self._reference(list(cells)), redistribute(list(cells)))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_redistribute_array(self):
+        rng = random.Random(0)
+        for n in [1, 2, 5, 17, 1_000]:
+            cells = [rng.randint(0, 5 * n) for _ in range(n)]
+            self.assertEqual(self._reference(list(cells)),
+                             redistribute(np.array(cells, dtype=np.int64)).tolist())
+
+    def test_redistribute_large(self):
+        self.assertEqual([2_000_002, 2_000_001, 2_000_000, 2_000_000, 2_000_003],
+                         redistribute([1, 1, 0, 10 ** 7 + 2, 2]))
+
+    def test_find_loop(self):
+        cells = [0, 2, 7, 0]
+        self.assertEqual((5, 4), find_loop(cells))
+        self.assertEqual([0, 2, 7, 0], cells)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_find_loop_array(self):
+        rng = random.Random(0)
+        for n in [1, 4, 16]:
+            cells = [rng.randint(0, 15) for _ in range(n)]
+            self.assertEqual(find_loop(cells, numpy_banks=n + 1), find_loop(cells, numpy_banks=1))
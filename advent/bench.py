@@ -0,0 +1,365 @@
+"""
+Benchmark the solvers' public functions over growing synthetic inputs.
+
+Each benchmark times one function at several input sizes (generated by :mod:`advent.generate`),
+fits the empirical complexity to the timings and compares the result against a stored baseline.
+A benchmark regresses when its time at the largest size exceeds the baseline's by more than
+``--margin``, or when its fitted exponent grows by more than ``--exponent-margin``.  A benchmark
+whose sizes no longer match the baseline's fails too, until the baseline is saved again.
+
+Usage, from the repository root::
+
+    python -m advent.bench [name ...] [--save-baseline] [--baseline FILE] [--output FILE]
+
+where each ``name`` selects benchmarks by name (``checksum``) or solver key (``021``).  The exit
+status is 1 if any benchmark regressed.
+"""
+import argparse
+from array import array
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Tuple
+import unittest
+
+from advent import captcha, spiral
+from advent.cache import DEFAULT_DIR as CACHE_DIR
+from advent.generate import generate
+from advent.runner import SOLVERS, load_module
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(CACHE_DIR), 'bench-baseline.json')
+
+MODELS = {
+    '1': lambda n: 1,
+    'log n': lambda n: math.log(n),
+    'n': lambda n: n,
+    'n log n': lambda n: n * math.log(n),
+    'n^2': lambda n: n ** 2,
+    'n^3': lambda n: n ** 3,
+    '2^n': lambda n: 2.0 ** n
+}  # type: Dict[str, Callable[[int], float]]
+
+
+class Benchmark(object):
+    def __init__(self,
+                 name: str,
+                 key: str,
+                 sizes: List[int],
+                 setup: Callable[[ModuleType, int, int], Tuple]=None,
+                 run: Callable[..., Any]=None):
+        """
+        :param name: the function being benchmarked
+        :param key: the solver module the function lives in
+        :param sizes: the input sizes to time, in increasing order
+        :param setup: builds the function's arguments from the module, size and seed; defaults to
+            parsing the day's generated input with the registered solver
+        :param run: called with the module and the arguments; defaults to the registered solver
+        """
+        self.name = name
+        self.key = key
+        self.sizes = sizes
+        self._setup = setup
+        self._run = run
+
+    def setup(self, module: ModuleType, size: int, seed: int) -> Tuple:
+        if self._setup is not None:
+            return self._setup(module, size, seed)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'input.txt')
+            with open(path, 'w') as f:
+                for chunk in generate(int(self.key[:2]), size, seed):
+                    f.write(chunk)
+            return SOLVERS[self.key].parse(module, path)
+
+    def run(self, module: ModuleType, *args) -> Any:
+        if self._run is not None:
+            return self._run(module, *args)
+        return SOLVERS[self.key].solve(module, *args)
+
+    def __repr__(self):
+        return 'Benchmark({}, {})'.format(self.name, self.key)
+
+
+def _random_grid(module: ModuleType, size: int, seed: int) -> Tuple:
+    rng = random.Random(seed)
+    return [[rng.random() < 0.5 for _ in range(size)] for _ in range(size)],
+
+
+def _divisible_row(module: ModuleType, size: int, seed: int) -> Tuple:
+    """
+    A single spreadsheet row of about ``size`` cells with exactly one evenly divisible pair.
+
+    All but one cell lie strictly between ``n`` and ``2n``, so none divides another, and the pair's
+    smaller cell is below ``1.5n`` so its double is divisible by nothing else in the row.
+    """
+    rng = random.Random(seed)
+    n = 10 * size
+    row = rng.sample(range(n + 1, 2 * n), size - 1)
+    smaller = rng.randrange(n + 1, n + n // 2)
+    row += [2 * smaller] + ([smaller] if smaller not in row else [])
+    rng.shuffle(row)
+    return row,
+
+
+def _spiral_indices(module: ModuleType, size: int, seed: int) -> Tuple:
+    rng = random.Random(seed)
+    return array('q', (rng.randrange(1, 10 ** 12) for _ in range(size))),
+
+
+def _spiral_values(module: ModuleType, size: int, seed: int) -> Tuple:
+    """
+    Day 3 part 2's spiral with the neighbor sums kept modulo a prime, so the values stay small.
+    """
+    return spiral.accumulate(reduce=lambda values: sum(values) % 1_000_003), size
+
+
+def _full_banks(module: ModuleType, size: int, seed: int) -> Tuple:
+    rng = random.Random(seed)
+    return [rng.randint(0, 10 ** 6) for _ in range(size)],
+
+
+def _checksum_permutations(data: List[List[int]]) -> int:
+    """
+    Day 2 part 2 as originally written, trying every ordered pair of cells, kept for comparison.
+    """
+    running_sum = 0
+    for line in data:
+        for first, second in itertools.permutations(line, 2):
+            if int(first / second) == (first / second):
+                running_sum += int(first / second)
+                break
+    return running_sum
+
+
+BENCHMARKS = [
+    Benchmark('count_each', '011', [500, 1_000, 2_000, 4_000],
+              run=lambda m, nums: [captcha.count(nums, x) for x in range(len(nums))]),
+    Benchmark('count_all', '011', [2_000, 8_000, 32_000, 128_000], run=lambda m, nums: captcha.count_all(nums)),
+    Benchmark('checksum', '021', [2_000, 4_000, 8_000, 16_000]),
+    Benchmark('checksum', '022', [2_000, 4_000, 8_000, 16_000]),
+    Benchmark('checksum_pairs', '022', [250, 500, 1_000, 2_000], _divisible_row,
+              lambda m, row: _checksum_permutations([row])),
+    Benchmark('row_quotient', '022', [12_500, 25_000, 50_000, 100_000], _divisible_row,
+              lambda m, row: m.checksum([row])),
+    Benchmark('dist', '031', [10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9]),
+    Benchmark('dist_each', '031', [25_000, 50_000, 100_000, 200_000], _spiral_indices,
+              lambda m, indices: [m.dist(x) for x in indices]),
+    Benchmark('dist_many', '031', [250_000, 500_000, 1_000_000, 2_000_000], _spiral_indices,
+              lambda m, indices: spiral.dist_many(indices)),
+    Benchmark('accumulate', '032', [125_000, 250_000, 500_000, 1_000_000], _spiral_values,
+              lambda m, values, size: sum(1 for _ in itertools.islice(values, size))),
+    Benchmark('is_valid', '041', [5_000, 10_000, 20_000, 40_000]),
+    Benchmark('is_valid', '042', [5_000, 10_000, 20_000, 40_000]),
+    Benchmark('do_jumps', '051', [500, 1_000, 2_000, 4_000]),
+    Benchmark('do_jumps', '052', [100, 200, 400]),
+    Benchmark('rebalance', '061', [16, 32, 64, 128]),
+    Benchmark('single_rebalance', '061', [12_500, 25_000, 50_000, 100_000], _full_banks,
+              lambda m, cells: m.single_rebalance(cells)),
+    Benchmark('hash', '102', [16, 32, 64, 128]),
+    Benchmark('count_groups', '122', [250, 500, 1_000, 2_000]),
+    Benchmark('build_map', '141', [64, 128, 256, 512],
+              lambda m, size, seed: ('bench-{}'.format(seed), size), lambda m, *args: m.build_map(*args)),
+    Benchmark('count_regions', '142', [32, 64, 96, 128], _random_grid, lambda m, grid: m.count_regions(grid)),
+    Benchmark('score', '152', [10_000, 20_000, 40_000, 80_000],
+              lambda m, size, seed: (size, 65, 8921), lambda m, *args: m.score(*args)),
+    Benchmark('execute', '161', [1_000, 2_000, 4_000, 8_000]),
+    Benchmark('execute_all', '162', [100, 200, 400, 800]),
+    Benchmark('spinlock', '172', [100_000, 200_000, 400_000, 800_000],
+              lambda m, size, seed: (3, size), lambda m, *args: m.spinlock(*args)),
+    Benchmark('build', '241', [8, 12, 16, 20]),
+    Benchmark('run', '251', [10_000, 20_000, 40_000, 80_000],
+              lambda m, size, seed: (m.Machine(m.build()), size), lambda m, *args: m.run(*args))
+]
+
+
+def fit_complexity(sizes: List[int], times: List[float]) -> Dict[str, Any]:
+    """
+    Fit timings to a power law and to the closest of a set of complexity classes.
+
+    :param sizes: the input sizes
+    :param times: the time taken at each size
+
+    :return: the power law's exponent and the name of the best fitting model in :data:`MODELS`
+    """
+    xs = [math.log(x) for x in sizes]
+    ys = [math.log(max(y, 1e-9)) for y in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x if var_x > 0 else 0.0
+
+    def residual(model: Callable[[int], float]) -> float:
+        try:
+            fs = [model(x) for x in sizes]
+            scale = sum(t * f for t, f in zip(times, fs)) / sum(f * f for f in fs)
+        except (OverflowError, ZeroDivisionError):
+            return float('inf')
+        return sum(((t - scale * f) / max(t, 1e-9)) ** 2 for t, f in zip(times, fs))
+
+    return {
+        'exponent': exponent,
+        'model': min(MODELS.keys(), key=lambda x: residual(MODELS[x]))
+    }
+
+
+def run_benchmark(bench: Benchmark, repeat: int=3, seed: int=0) -> Dict[str, Any]:
+    """
+    Time a benchmark at each of its sizes, keeping the best of ``repeat`` runs.
+
+    Arguments are rebuilt before every run, as several solvers consume or mutate their input.
+    """
+    module = load_module(SOLVERS[bench.key])
+    times = []  # type: List[float]
+    for size in bench.sizes:
+        best = float('inf')
+        for _ in range(repeat):
+            args = bench.setup(module, size, seed)
+            start = time.perf_counter()
+            bench.run(module, *args)
+            best = min(best, time.perf_counter() - start)
+        times += [best]
+
+    result = {
+        'name': bench.name,
+        'key': bench.key,
+        'sizes': bench.sizes,
+        'times': times
+    }  # type: Dict[str, Any]
+    result.update(fit_complexity(bench.sizes, times))
+    return result
+
+
+def result_id(result: Dict[str, Any]) -> str:
+    return '{}:{}'.format(result['key'], result['name'])
+
+
+def compare(result: Dict[str, Any],
+            baseline: Dict[str, Any],
+            margin: float,
+            exponent_margin: float) -> List[str]:
+    """
+    :return: a description of each way ``result`` regressed against ``baseline``; empty if none.
+        Results for different sizes cannot be compared, which is reported as a problem too so the
+        check is not silently skipped.
+    """
+    problems = []  # type: List[str]
+    if result['sizes'] != baseline['sizes']:
+        return ['sizes changed from {} to {}, re-save the baseline'.format(baseline['sizes'], result['sizes'])]
+
+    slowdown = result['times'][-1] / max(baseline['times'][-1], 1e-9)
+    if slowdown > 1 + margin:
+        problems += ['{:.2f}x slower at size {} ({:.4f}s vs {:.4f}s)'.format(
+            slowdown, result['sizes'][-1], result['times'][-1], baseline['times'][-1])]
+    if result['exponent'] > baseline['exponent'] + exponent_margin:
+        problems += ['complexity grew from n^{:.2f} to n^{:.2f}'.format(baseline['exponent'], result['exponent'])]
+    return problems
+
+
+def select(benchmarks: List[Benchmark], patterns: List[str]) -> List[Benchmark]:
+    if len(patterns) == 0:
+        return benchmarks
+    return [x for x in benchmarks if x.name in patterns or any(x.key.startswith(y) for y in patterns)]
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.bench', description=__doc__.split('\n\n')[0])
+    parser.add_argument('names', nargs='*', help='benchmark names or solver keys to run; defaults to all')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size, keeping the fastest')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated inputs')
+    parser.add_argument('--output', help='where to write the JSON results')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='stored results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--margin', type=float, default=0.25,
+                        help='allowed fractional slowdown at the largest size')
+    parser.add_argument('--exponent-margin', type=float, default=0.5,
+                        help='allowed growth of the fitted complexity exponent')
+    args = parser.parse_args(argv)
+
+    # the day modules leave logging setup to their __main__ blocks, so their trace logging stays off
+    logging.basicConfig(level=logging.WARNING)
+
+    baseline = {}  # type: Dict[str, Dict[str, Any]]
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = {result_id(x): x for x in json.load(f)}
+
+    results = []  # type: List[Dict[str, Any]]
+    regressed = False
+    for bench in select(BENCHMARKS, args.names):
+        result = run_benchmark(bench, args.repeat, args.seed)
+        results += [result]
+        problems = []  # type: List[str]
+        if result_id(result) in baseline:
+            problems = compare(result, baseline[result_id(result)], args.margin, args.exponent_margin)
+            regressed = regressed or len(problems) > 0
+        print('{} {:<14} n^{:<5.2f} ~ O({:<7}) {}  {}'.format(
+            result['key'],
+            result['name'],
+            result['exponent'],
+            result['model'],
+            ' '.join('{:.4f}s'.format(x) for x in result['times']),
+            'REGRESSED: ' + '; '.join(problems) if problems else ''), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print('Saved {} benchmarks to {}'.format(len(results), args.baseline))
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsBench(unittest.TestCase):
+    def test_fit_linear(self):
+        fit = fit_complexity([1_000, 2_000, 4_000, 8_000], [0.001, 0.002, 0.004, 0.008])
+        self.assertAlmostEqual(1.0, fit['exponent'])
+        self.assertEqual('n', fit['model'])
+
+    def test_fit_quadratic(self):
+        fit = fit_complexity([10, 20, 40, 80], [0.01, 0.04, 0.16, 0.64])
+        self.assertAlmostEqual(2.0, fit['exponent'])
+        self.assertEqual('n^2', fit['model'])
+
+    def test_compare_ok(self):
+        base = {'sizes': [1, 2], 'times': [1.0, 2.0], 'exponent': 1.0}
+        self.assertEqual([], compare({'sizes': [1, 2], 'times': [1.0, 2.2], 'exponent': 1.1}, base, 0.25, 0.5))
+
+    def test_compare_slower(self):
+        base = {'sizes': [1, 2], 'times': [1.0, 2.0], 'exponent': 1.0}
+        self.assertEqual(1, len(compare({'sizes': [1, 2], 'times': [1.0, 3.0], 'exponent': 1.0}, base, 0.25, 0.5)))
+
+    def test_compare_complexity(self):
+        base = {'sizes': [1, 2], 'times': [1.0, 2.0], 'exponent': 1.0}
+        self.assertEqual(1, len(compare({'sizes': [1, 2], 'times': [0.5, 2.0], 'exponent': 2.0}, base, 0.25, 0.5)))
+
+    def test_compare_sizes_changed(self):
+        base = {'sizes': [1, 2], 'times': [1.0, 2.0], 'exponent': 1.0}
+        problems = compare({'sizes': [1, 4], 'times': [1.0, 2.0], 'exponent': 1.0}, base, 0.25, 0.5)
+        self.assertEqual(1, len(problems))
+        self.assertIn('re-save the baseline', problems[0])
+
+    def test_run_benchmark(self):
+        result = run_benchmark(Benchmark('checksum', '021', [10, 20]), repeat=1)
+        self.assertEqual([10, 20], result['sizes'])
+        self.assertEqual(2, len(result['times']))
+        self.assertIn(result['model'], MODELS)
+
+    def test_select(self):
+        self.assertEqual(['021', '022'], [x.key for x in select(BENCHMARKS, ['checksum'])])
+        self.assertEqual(['hash'], [x.name for x in select(BENCHMARKS, ['102'])])
@@ -0,0 +1,269 @@
+"""
+Content-addressed on-disk cache of solver results.
+
+Entries are keyed by a hash of the solver's source file, every repository module it imports directly
+or not (see :func:`local_sources`) and its input bytes, so editing any of them misses the cache while
+unrelated changes keep hitting it.  The store holds at most ``max_entries``
+results, evicting the least recently used first.
+
+Usage, from the repository root::
+
+    python -m advent.cache list
+    python -m advent.cache invalidate [key ...]
+
+where each ``key`` selects cached results by day (``15``) or by module suffix (``152``); with no
+keys the whole cache is cleared.
+"""
+import argparse
+import ast
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, List, Set, Tuple
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIR = os.path.join(ROOT, '.cache', 'results')
+
+
+def _module_path(name: str, dirs: List[str]) -> str:
+    """
+    :return: the source file of the module or package with the dotted ``name`` in one of ``dirs``,
+        or None if it is not there, e.g. for the standard library
+    """
+    base = name.replace('.', os.sep)
+    for d in dirs:
+        for path in [os.path.join(d, base + '.py'), os.path.join(d, base, '__init__.py')]:
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def local_sources(path: str, root: str=ROOT) -> List[str]:
+    """
+    Find the source files a script runs: itself and every module under ``root`` or next to it that
+    it imports, directly or through other such modules.
+
+    :param path: the script
+    :param root: the directory holding the repository's packages
+
+    :return: the source files, sorted
+    """
+    dirs = [os.path.dirname(os.path.abspath(path)), root]
+    seen = set()  # type: Set[str]
+    todo = [os.path.abspath(path)]
+    while len(todo) > 0:
+        src = todo.pop()
+        if src in seen:
+            continue
+        seen.add(src)
+        with open(src, 'rb') as f:
+            tree = ast.parse(f.read(), src)
+        names = []  # type: List[str]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names += [x.name for x in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+                # the imported names may be submodules as well as attributes
+                names += [node.module] + ['{}.{}'.format(node.module, x.name) for x in node.names]
+        for name in names:
+            # importing a submodule runs its packages' __init__ first
+            parts = name.split('.')
+            for i in range(1, len(parts) + 1):
+                dep = _module_path('.'.join(parts[:i]), dirs)
+                if dep is not None:
+                    todo.append(os.path.abspath(dep))
+    return sorted(seen)
+
+
+class ResultCache(object):
+    def __init__(self, directory: str=DEFAULT_DIR, max_entries: int=256):
+        self._dir = directory
+        self._max_entries = max_entries
+
+    @staticmethod
+    def digest(key: str, *paths: str) -> str:
+        """
+        Hash a solver's identity together with the contents of the files it depends on.
+
+        :param key: the solver's module suffix, distinguishing solvers that share an input
+        :param paths: the solver's source files and input file
+
+        :return: the hex digest addressing the solver's cached result
+        """
+        h = hashlib.sha256(key.encode())
+        for path in paths:
+            with open(path, 'rb') as f:
+                h.update(hashlib.sha256(f.read()).digest())
+        return h.hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self._dir, '{}.pickle'.format(digest))
+
+    def _entries(self) -> List[str]:
+        if not os.path.isdir(self._dir):
+            return []
+        return [os.path.join(self._dir, x) for x in os.listdir(self._dir) if x.endswith('.pickle')]
+
+    def get(self, digest: str) -> Tuple[bool, Any]:
+        """
+        :return: (whether the result was cached, the cached entry)
+        """
+        path = self._path(digest)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        return True, entry
+
+    def put(self, digest: str, key: str, value: Any):
+        os.makedirs(self._dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'key': key, 'value': value}, f)
+        os.replace(tmp, self._path(digest))
+        self._evict()
+
+    def _evict(self):
+        def mtime(path: str) -> float:
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+
+        entries = sorted(self._entries(), key=mtime)
+        for path in entries[:max(0, len(entries) - self._max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def list(self) -> List[Tuple[str, str]]:
+        """
+        :return: (solver key, digest) of every cached result, most recently used first
+        """
+        out = []  # type: List[Tuple[float, str, str]]
+        for path in self._entries():
+            try:
+                with open(path, 'rb') as f:
+                    key = pickle.load(f)['key']
+                out += [(os.path.getmtime(path), key, os.path.basename(path)[:-len('.pickle')])]
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+        return [(key, digest) for _, key, digest in sorted(out, reverse=True)]
+
+    def invalidate(self, patterns: List[str]=()) -> int:
+        """
+        Remove cached results.
+
+        :param patterns: days (``'15'``) or module suffixes (``'152'``) to remove; empty removes all
+
+        :return: the number of results removed
+        """
+        removed = 0
+        for key, digest in self.list():
+            if len(patterns) == 0 or any(key.startswith(x) for x in patterns):
+                try:
+                    os.remove(self._path(digest))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.cache', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cache-dir', default=DEFAULT_DIR, help='where cached results are stored')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    commands.add_parser('list', help='show cached results')
+    invalidate = commands.add_parser('invalidate', help='remove cached results')
+    invalidate.add_argument('keys', nargs='*', help='days (15) or day/parts (152) to remove; defaults to all')
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache_dir)
+    if args.command == 'list':
+        for key, digest in cache.list():
+            print('{} {}'.format(key, digest))
+    elif args.command == 'invalidate':
+        print('Removed {} cached results'.format(cache.invalidate(args.keys)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(os.path.join(self._tmp.name, 'results'), max_entries=2)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self._tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_digest_content_addressed(self):
+        src = self._write('main.py', b'print(1)')
+        inp = self._write('input.txt', b'123')
+        digest = ResultCache.digest('011', src, inp)
+        self.assertEqual(digest, ResultCache.digest('011', src, inp))
+        self.assertNotEqual(digest, ResultCache.digest('012', src, inp))
+        self._write('input.txt', b'124')
+        self.assertNotEqual(digest, ResultCache.digest('011', src, inp))
+
+    def test_local_sources(self):
+        self._write('main.py', b'import os\nfrom lib import helper\n')
+        os.mkdir(os.path.join(self._tmp.name, 'lib'))
+        self._write(os.path.join('lib', '__init__.py'), b'')
+        self._write(os.path.join('lib', 'helper.py'), b'from lib.util import twice\n')
+        self._write(os.path.join('lib', 'util.py'), b'def twice(x): return 2 * x\n')
+        self._write(os.path.join('lib', 'unused.py'), b'')
+        main = os.path.join(self._tmp.name, 'main.py')
+        self.assertEqual(sorted(os.path.join(self._tmp.name, x) for x in
+                                ['main.py', 'lib/__init__.py', 'lib/helper.py', 'lib/util.py']),
+                         local_sources(main, self._tmp.name))
+
+    def test_digest_dependency_changed(self):
+        self._write('main.py', b'from lib import twice\n')
+        self._write('lib.py', b'def twice(x): return 2 * x\n')
+        main = os.path.join(self._tmp.name, 'main.py')
+        inp = self._write('input.txt', b'123')
+        digest = ResultCache.digest('011', *local_sources(main, self._tmp.name), inp)
+        self.assertEqual(digest, ResultCache.digest('011', *local_sources(main, self._tmp.name), inp))
+        self._write('lib.py', b'def twice(x): return x + x\n')
+        self.assertNotEqual(digest, ResultCache.digest('011', *local_sources(main, self._tmp.name), inp))
+
+    def test_miss(self):
+        self.assertEqual((False, None), self.cache.get('abc'))
+
+    def test_put_get(self):
+        self.cache.put('abc', '011', ('x', 1))
+        self.assertEqual((True, {'key': '011', 'value': ('x', 1)}), self.cache.get('abc'))
+
+    def test_lru_eviction(self):
+        self.cache.put('a', '011', 1)
+        self.cache.put('b', '012', 2)
+        os.utime(self.cache._path('a'), (0, 0))
+        os.utime(self.cache._path('b'), (1, 1))
+        self.cache.get('a')
+        self.cache.put('c', '021', 3)
+        self.assertEqual(['a', 'c'], sorted(x[1] for x in self.cache.list()))
+
+    def test_invalidate(self):
+        self.cache.put('a', '011', 1)
+        self.cache.put('b', '021', 2)
+        self.assertEqual(1, self.cache.invalidate(['01']))
+        self.assertEqual([('021', 'b')], self.cache.list())
+        self.assertEqual(1, self.cache.invalidate())
+        self.assertEqual([], self.cache.list())
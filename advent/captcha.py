@@ -0,0 +1,239 @@
+"""
+Vectorized inverse captcha (day 1) for inputs of hundreds of millions of digits.
+
+The digits are read from the memory-mapped input as a ``uint8`` array and the sum of the digits
+matching the digit ``offset`` places further round the circle is taken with one array comparison and
+a masked sum, so both the next-digit (offset 1) and halfway-around (offset ``n / 2``) captchas run
+at memory speed.  :func:`count_all` gives the captcha at every offset at once, from the circular
+autocorrelation of each digit's indicator computed by FFT in O(n log n), where calling :func:`count`
+for each offset would take O(n^2).  Without NumPy the same functions fall back to plain lists.
+
+:func:`count_stream` instead takes the next-digit captcha over the input in fixed-size chunks,
+carrying the last digit of each chunk over to the next and comparing the last digit of the input
+with the first at the end, so memory stays constant however long the input is.
+
+Usage, from the repository root::
+
+    python -m advent.captcha [--stream] [FILE]
+
+prints both captchas of the digits in ``FILE``, or stdin if not given; with ``--stream`` only the
+next-digit captcha is printed, as the halfway one needs half the input in memory.
+"""
+import argparse
+import io
+import sys
+from typing import BinaryIO, Iterable, Iterator, List, Sequence
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from advent.loader import Input, TempInputMixin, load
+
+
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = b' \t\r\n'
+
+
+def digits(inp: Input) -> Sequence[int]:
+    """
+    :param inp: the puzzle input, a single line of digits
+
+    :return: the digits, as a ``uint8`` array if NumPy is installed and a list otherwise
+    """
+    raw = inp.view()
+    end = len(raw)
+    while end > 0 and raw[end - 1] in b' \t\r\n':
+        end -= 1
+    if np is None:
+        out = [x - 48 for x in raw[:end]]  # type: Sequence[int]
+        if any(not 0 <= x <= 9 for x in out):
+            raise ValueError('Input is not a string of digits')
+        return out
+    out = np.frombuffer(raw[:end], dtype=np.uint8) - ord('0')
+    if end > 0 and out.max() > 9:
+        raise ValueError('Input is not a string of digits')
+    return out
+
+
+def count(nums: Sequence[int], offset: int=1) -> int:
+    """
+    :param nums: the digits, in a circle
+    :param offset: how many places round the circle each digit is compared to
+
+    :return: the sum of the digits that match the digit ``offset`` places after them
+    """
+    n = len(nums)
+    if n == 0:
+        return 0
+    offset %= n
+    if np is None or not isinstance(nums, np.ndarray):
+        return sum(x for i, x in enumerate(nums) if x == nums[(i + offset) % n])
+    # the comparison against the array rolled by offset, as two slices so nothing is copied
+    head = nums[:n - offset]
+    tail = nums[n - offset:]
+    return (int(head.sum(where=head == nums[offset:], dtype=np.int64)) +
+            int(tail.sum(where=tail == nums[:offset], dtype=np.int64)))
+
+
+def halfway(nums: Sequence[int]) -> int:
+    return count(nums, len(nums) // 2)
+
+
+def count_all(nums: Sequence[int]) -> Sequence[int]:
+    """
+    :param nums: the digits, in a circle
+
+    :return: for each offset from 0 to ``len(nums) - 1``, the captcha at that offset
+    """
+    n = len(nums)
+    if np is None or not isinstance(nums, np.ndarray):
+        return [count(nums, x) for x in range(n)]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    # sum over d of d * the number of positions i with nums[i] == nums[i + k] == d, for every k
+    power = np.zeros(n // 2 + 1)
+    for digit in range(1, 10):
+        spectrum = np.fft.rfft(nums == digit)
+        power += digit * (spectrum.real ** 2 + spectrum.imag ** 2)
+    return np.rint(np.fft.irfft(power, n)).astype(np.int64)
+
+
+def read_chunks(f: BinaryIO, chunk_size: int=CHUNK_SIZE) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(chunk_size)
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def _adjacent_sum(chunk: bytes) -> int:
+    """
+    :return: the sum of the digits in the chunk equal to the digit after them, not wrapping around
+    """
+    if np is None:
+        if any(not 48 <= x <= 57 for x in chunk):
+            raise ValueError('Input is not a string of digits')
+        return sum(x - 48 for x, y in zip(chunk, chunk[1:]) if x == y)
+    nums = np.frombuffer(chunk, dtype=np.uint8) - ord('0')
+    if nums.max() > 9:
+        raise ValueError('Input is not a string of digits')
+    head = nums[:-1]
+    return int(head.sum(where=head == nums[1:], dtype=np.int64))
+
+
+def count_stream(chunks: Iterable[bytes]) -> int:
+    """
+    Take the next-digit captcha of a stream of digits, one chunk at a time.
+
+    :param chunks: the input, split anywhere; whitespace is ignored
+
+    :return: the same as :func:`count` with an offset of 1
+    """
+    first = None
+    last = None
+    total = 0
+    for chunk in chunks:
+        chunk = chunk.translate(None, _WHITESPACE)
+        if len(chunk) == 0:
+            continue
+        if first is None:
+            first = chunk[0]
+        elif last == chunk[0]:
+            total += last - 48
+        total += _adjacent_sum(chunk)
+        last = chunk[-1]
+    if first is not None and last == first:
+        total += last - 48
+    return total
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.captcha', description=__doc__.split('\n\n')[0])
+    parser.add_argument('file', nargs='?', help='the digits; defaults to stdin')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the input in chunks in constant memory, printing only the next-digit captcha')
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        if args.file is None:
+            print(count_stream(read_chunks(sys.stdin.buffer)))
+        else:
+            with open(args.file, 'rb') as f:
+                print(count_stream(read_chunks(f)))
+        return 0
+
+    with load([args.file] if args.file is not None else []) as inp:
+        nums = digits(inp)
+        print(count(nums))
+        print(halfway(nums))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsCaptcha(TempInputMixin, unittest.TestCase):
+    def _digits(self, content: bytes) -> Sequence[int]:
+        return digits(self._input(content))
+
+    def test_count(self):
+        self.assertEqual(3, count(self._digits(b'1122\n')))
+        self.assertEqual(4, count(self._digits(b'1111')))
+        self.assertEqual(0, count(self._digits(b'1234')))
+        self.assertEqual(9, count(self._digits(b'91212129\n')))
+
+    def test_halfway(self):
+        self.assertEqual(6, halfway(self._digits(b'1212')))
+        self.assertEqual(0, halfway(self._digits(b'1221')))
+        self.assertEqual(4, halfway(self._digits(b'123425')))
+        self.assertEqual(12, halfway(self._digits(b'123123')))
+        self.assertEqual(4, halfway(self._digits(b'12131415')))
+
+    def test_list(self):
+        self.assertEqual(9, count([9, 1, 2, 1, 2, 1, 2, 9]))
+        self.assertEqual(4, halfway([1, 2, 1, 3, 1, 4, 1, 5]))
+
+    def test_empty(self):
+        self.assertEqual(0, count(self._digits(b'\n')))
+
+    def test_not_digits(self):
+        with self.assertRaises(ValueError):
+            self._digits(b'12a4')
+
+    def test_count_all(self):
+        nums = [1, 2, 1, 3, 1, 4, 1, 5]
+        self.assertEqual([count(nums, x) for x in range(len(nums))], list(count_all(nums)))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_count_all_fft(self):
+        nums = np.random.RandomState(0).randint(0, 10, 1_001).astype(np.uint8)
+        self.assertEqual([count(nums, x) for x in range(len(nums))], count_all(nums).tolist())
+        self.assertEqual([], count_all(nums[:0]).tolist())
+
+    def test_count_stream(self):
+        self.assertEqual(3, count_stream([b'1122\n']))
+        self.assertEqual(4, count_stream([b'11', b'', b'11']))
+        self.assertEqual(9, count_stream([b'9', b'1212', b'12', b'9\n']))
+        self.assertEqual(5, count_stream([b'5']))
+        self.assertEqual(0, count_stream([]))
+
+    def test_count_stream_chunks(self):
+        text = b'683763347952248558274598352939674972954641755898815882568823\n'
+        expected = count(self._digits(text))
+        for size in [1, 2, 7, 64]:
+            self.assertEqual(expected, count_stream(read_chunks(io.BytesIO(text), size)))
+
+    def test_count_stream_not_digits(self):
+        with self.assertRaises(ValueError):
+            count_stream([b'12', b'a4'])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_matches_list(self):
+        nums = np.random.RandomState(0).randint(0, 10, 10_000).astype(np.uint8)
+        for offset in [1, 7, 5_000, 9_999]:
+            self.assertEqual(count(nums.tolist(), offset), count(nums, offset))
@@ -0,0 +1,491 @@
+"""
+Generate synthetic puzzle inputs of a chosen size, for scaling benchmarks.
+
+Each day has a generator producing text in the same format as that day's ``input.txt``, built so
+the solvers accept it (e.g. every day 7 tower has exactly one unbalanced program, every day 13
+firewall has a safe delay).  What ``size`` measures depends on the day and is given in each
+generator's docstring; days whose input has no natural size (15, 21) ignore it.
+
+Usage, from the repository root::
+
+    python -m advent.generate DAY SIZE [--seed N] [--output FILE]
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import string
+import sys
+import tempfile
+from typing import Callable, Dict, Iterator, List, Tuple
+import unittest
+
+from advent.runner import SOLVERS, load_module
+
+
+Generator = Callable[[int, random.Random], Iterator[str]]
+
+
+def _chunked(items: Iterator[str], sep: str, chunk: int=10_000) -> Iterator[str]:
+    first = True
+    while True:
+        batch = list(itertools.islice(items, chunk))
+        if len(batch) == 0:
+            return
+        yield ('' if first else sep) + sep.join(batch)
+        first = False
+
+
+def _names(count: int, rng: random.Random, min_len: int=4, max_len: int=8) -> List[str]:
+    seen = set([])
+    out = []  # type: List[str]
+    while len(out) < count:
+        name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(min_len, max_len)))
+        if name not in seen:
+            seen.add(name)
+            out += [name]
+    return out
+
+
+def captcha(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 1: ``size`` digits."""
+    yield from _chunked((rng.choice(string.digits) for _ in range(size)), '')
+    yield '\n'
+
+
+def spreadsheet(size: int, rng: random.Random, cols: int=16) -> Iterator[str]:
+    """Day 2: ``size`` rows of tab-separated cells, each row holding an evenly divisible pair."""
+    for _ in range(size):
+        divisor = rng.randint(2, 500)
+        row = [divisor, divisor * rng.randint(2, 9)] + [rng.randint(100, 5000) for _ in range(cols - 2)]
+        rng.shuffle(row)
+        yield '\t'.join(str(x) for x in row) + '\n'
+
+
+def spiral(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 3: the spiral index ``size``."""
+    yield '{}\n'.format(size)
+
+
+def passphrases(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 4: ``size`` passphrases of short lowercase words."""
+    for _ in range(size):
+        yield ' '.join(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 7)))
+                       for _ in range(rng.randint(3, 11))) + '\n'
+
+
+def jumps(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 5: ``size`` jump offsets, mostly pointing backwards like the puzzle's."""
+    for i in range(size):
+        yield '{}\n'.format(rng.randint(-i, 2))
+
+
+def banks(size: int, rng: random.Random, max_value: int=15) -> Iterator[str]:
+    """Day 6: ``size`` memory banks holding up to ``max_value`` blocks each."""
+    yield '\t'.join(str(rng.randint(0, max_value)) for _ in range(size)) + '\n'
+
+
+def tower(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 7: a tower of about ``size`` programs with exactly one program of the wrong weight."""
+    size = max(size, 4)
+    names = _names(size, rng)
+    children = [[] for _ in range(size)]  # type: List[List[int]]
+    weights = [rng.randint(1, 100) for _ in range(size)]
+    leaves = [0]
+    used = 1
+    while used + 3 <= size:
+        parent = leaves.pop(rng.randrange(len(leaves)))
+        num = min(rng.randint(3, 6), size - used)
+        children[parent] = list(range(used, used + num))
+        leaves += children[parent]
+        used += num
+
+    # balance bottom-up: children are numbered after their parent, so reverse order is post-order
+    totals = list(weights)
+    for node in reversed(range(used)):
+        if len(children[node]) > 0:
+            target = max(totals[x] for x in children[node]) + rng.randint(0, 10)
+            for child in children[node]:
+                weights[child] += target - totals[child]
+            totals[node] = weights[node] + target * len(children[node])
+    weights[rng.randrange(1, used)] += rng.randint(1, 10)
+
+    order = list(range(used))
+    rng.shuffle(order)
+    for node in order:
+        line = '{} ({})'.format(names[node], weights[node])
+        if len(children[node]) > 0:
+            line += ' -> ' + ', '.join(names[x] for x in children[node])
+        yield line + '\n'
+
+
+def registers(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 8: ``size`` conditional register instructions."""
+    # the solvers split each line on 'if', so no register may contain it
+    regs = [x for x in _names(max(3, min(size, 1000)), rng, 1, 3) if 'if' not in x]
+    for _ in range(size):
+        yield '{} {} {} if {} {} {}\n'.format(
+            rng.choice(regs),
+            rng.choice(['inc', 'dec']),
+            rng.randint(-1000, 1000),
+            rng.choice(regs),
+            rng.choice(['<', '<=', '==', '!=', '>=', '>']),
+            rng.randint(-10, 10))
+
+
+def stream(size: int, rng: random.Random, max_depth: int=20) -> Iterator[str]:
+    """Day 9: a stream of about ``size`` characters of nested groups and garbage."""
+    def garbage() -> str:
+        out = ['<']
+        for _ in range(rng.randint(0, 10)):
+            if rng.random() < 0.2:
+                out += ['!', rng.choice('!<>{}ae,')]
+            else:
+                out += [rng.choice('aeiou{}<,\'"')]
+        return ''.join(out + ['>'])
+
+    def items() -> Iterator[str]:
+        has_item = [False]
+        length = 1
+        yield '{'
+        while length < size:
+            r = rng.random()
+            if r < 0.6 or len(has_item) == 1:
+                token = garbage() if r < 0.3 or len(has_item) >= max_depth else '{'
+                if has_item[-1]:
+                    token = ',' + token
+                has_item[-1] = True
+                if token.endswith('{'):
+                    has_item += [False]
+            else:
+                token = '}'
+                has_item.pop()
+            length += len(token)
+            yield token
+        yield '}' * len(has_item)
+
+    yield from _chunked(items(), '')
+    yield '\n'
+
+
+def knot_lengths(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 10: ``size`` comma-separated lengths."""
+    yield ','.join(str(rng.randint(0, 255)) for _ in range(size)) + '\n'
+
+
+def hex_path(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 11: ``size`` comma-separated hex grid steps."""
+    yield from _chunked((rng.choice(['n', 'ne', 'se', 's', 'sw', 'nw']) for _ in range(size)), ',')
+    yield '\n'
+
+
+def pipes(size: int, rng: random.Random, max_degree: int=3) -> Iterator[str]:
+    """Day 12: a pipe graph of ``size`` programs, sparse enough to split into several groups."""
+    edges = [[] for _ in range(size)]  # type: List[List[int]]
+    for node in range(size):
+        for _ in range(rng.randint(0, max_degree - 1)):
+            other = rng.randrange(size)
+            edges[node] += [other]
+            edges[other] += [node]
+    for node in range(size):
+        yield '{} <-> {}\n'.format(node, ', '.join(str(x) for x in sorted(set(edges[node] or [node]))))
+
+
+def firewall(size: int, rng: random.Random, max_range: int=20) -> Iterator[str]:
+    """Day 13: ``size`` firewall layers, with ranges chosen so some delay gets through safely."""
+    delay = rng.randint(0, 10 * size)
+    depth = 0
+    for _ in range(size):
+        layer_range = rng.randint(2, max_range)
+        while (delay + depth) % (2 * (layer_range - 1)) == 0:
+            layer_range = rng.randint(2, max_range)
+        yield '{}: {}\n'.format(depth, layer_range)
+        depth += rng.randint(1, 2)
+
+
+def disk_key(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 14: a key string of ``size`` lowercase letters."""
+    yield ''.join(rng.choice(string.ascii_lowercase) for _ in range(max(size, 1))) + '\n'
+
+
+def judge_generators(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 15: the two generators' starting values (the number of rounds is not part of the input)."""
+    yield 'Generator A starts with {}\n'.format(rng.randint(1, 2147483646))
+    yield 'Generator B starts with {}\n'.format(rng.randint(1, 2147483646))
+
+
+def dance(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 16: ``size`` comma-separated dance moves among sixteen programs."""
+    programs = 'abcdefghijklmnop'
+
+    def move() -> str:
+        kind = rng.randrange(3)
+        if kind == 0:
+            return 's{}'.format(rng.randint(1, 15))
+        elif kind == 1:
+            return 'x{}/{}'.format(*rng.sample(range(16), 2))
+        else:
+            return 'p{}/{}'.format(*rng.sample(programs, 2))
+
+    yield from _chunked((move() for _ in range(size)), ',')
+    yield '\n'
+
+
+def spinlock(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 17: a step count of at most ``size``."""
+    yield '{}\n'.format(rng.randint(1, max(size, 1)))
+
+
+def duet(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 18: the puzzle's sorting program, sending and sorting ``size`` pseudo-random numbers."""
+    size = max(size, 2)
+    program = [
+        'set i 31', 'set a 1', 'mul p 17', 'jgz p p', 'mul a 2', 'add i -1', 'jgz i -2', 'add a -1',
+        'set i {}'.format(size), 'set p {}'.format(rng.randint(1, 10_000)), 'mul p 8505', 'mod p a',
+        'mul p 129749', 'add p 12345', 'mod p a', 'set b p', 'mod b 10000', 'snd b', 'add i -1', 'jgz i -9',
+        'jgz a 3', 'rcv b', 'jgz b -1', 'set f 0', 'set i {}'.format(size - 1), 'rcv a', 'rcv b',
+        'set p a', 'mul p -1', 'add p b', 'jgz p 4', 'snd a', 'set a b', 'jgz 1 3', 'snd b', 'set f 1',
+        'add i -1', 'jgz i -11', 'snd a', 'jgz f -16', 'jgz a -19'
+    ]
+    for line in program:
+        yield line + '\n'
+
+
+def tubes(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 19: a routing diagram whose path is about ``size`` cells long.
+
+    The path snakes downwards, alternating vertical and horizontal runs, and ends on a letter at the
+    end of a leftward run so the cell after it is a blank within the line.
+    """
+    width = max(12, int(size ** 0.5))
+    x = rng.randint(1, width - 2)
+    cells = {(x, 0): '|'}
+    y = 0
+    length = 1
+    while True:
+        run = rng.randint(2, 5)
+        for _ in range(run):
+            y += 1
+            cells[(x, y)] = '|'
+        cells[(x, y)] = '+'
+        length += run
+
+        is_last = length >= size and x >= 3
+        if is_last:
+            direction = -1
+        elif x + 2 > width - 2:
+            direction = -1
+        elif x - 2 < 1:
+            direction = 1
+        else:
+            direction = rng.choice([-1, 1])
+        max_run = x - 1 if direction == -1 else width - 2 - x
+        run = rng.randint(2, max(2, min(max_run, width // 2)))
+        for _ in range(run):
+            x += direction
+            cells[(x, y)] = '-'
+        length += run
+        if is_last:
+            cells[(x, y)] = rng.choice(string.ascii_uppercase)
+            break
+        cells[(x, y)] = '+'
+
+    straight = [k for k, v in cells.items() if v in '|-' and k[1] > 0]
+    for key in rng.sample(straight, min(len(straight), 25)):
+        cells[key] = rng.choice(string.ascii_uppercase)
+
+    for row in range(y + 2):
+        yield ''.join(cells.get((col, row), ' ') for col in range(width)) + '\n'
+
+
+def particles(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 20: ``size`` particles."""
+    def vec(bound: int) -> str:
+        return '<{},{},{}>'.format(*[rng.randint(-bound, bound) for _ in range(3)])
+
+    for _ in range(size):
+        yield 'p={}, v={}, a={}\n'.format(vec(3000), vec(150), vec(15))
+
+
+def _symmetries(pattern: Tuple[Tuple[bool, ...], ...]) -> List[Tuple[Tuple[bool, ...], ...]]:
+    out = []  # type: List[Tuple[Tuple[bool, ...], ...]]
+    for _ in range(4):
+        pattern = tuple(zip(*pattern[::-1]))
+        out += [pattern, tuple(x[::-1] for x in pattern)]
+    return out
+
+
+def _pattern_str(pattern) -> str:
+    return '/'.join(''.join('#' if x else '.' for x in row) for row in pattern)
+
+
+def rules(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 21: a complete rule book, one rule per 2x2 and 3x3 pattern up to rotation and flipping."""
+    for n in [2, 3]:
+        seen = set([])
+        for bits in itertools.product([False, True], repeat=n * n):
+            pattern = tuple(tuple(bits[i * n:(i + 1) * n]) for i in range(n))
+            if pattern in seen:
+                continue
+            seen.update(_symmetries(pattern))
+            output = [[rng.random() < 0.5 for _ in range(n + 1)] for _ in range(n + 1)]
+            yield '{} => {}\n'.format(_pattern_str(pattern), _pattern_str(output))
+
+
+def virus_grid(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 22: a ``size`` x ``size`` grid (rounded up to odd so it has a centre)."""
+    size = max(size, 1) | 1
+    for _ in range(size):
+        yield ''.join(rng.choice('#.') for _ in range(size)) + '\n'
+
+
+def coprocessor(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 23: the puzzle's prime-counting program, starting from ``b = size``."""
+    program = [
+        'set b {}'.format(max(size, 2)), 'set c b', 'jnz a 2', 'jnz 1 5', 'mul b 100', 'sub b -100000',
+        'set c b', 'sub c -17000', 'set f 1', 'set d 2', 'set e 2', 'set g d', 'mul g e', 'sub g b',
+        'jnz g 2', 'set f 0', 'sub e -1', 'set g e', 'sub g b', 'jnz g -8', 'sub d -1', 'set g d',
+        'sub g b', 'jnz g -13', 'jnz f 2', 'sub h -1', 'set g b', 'sub g c', 'jnz g 2', 'jnz 1 3',
+        'sub b -17', 'jnz 1 -23'
+    ]
+    for line in program:
+        yield line + '\n'
+
+
+def components(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 24: ``size`` bridge components, at least one with a zero port."""
+    max_port = max(2, size // 2)
+    yield '0/{}\n'.format(rng.randint(1, max_port))
+    for _ in range(size - 1):
+        yield '{}/{}\n'.format(rng.randint(0, max_port), rng.randint(0, max_port))
+
+
+def blueprint(size: int, rng: random.Random, num_states: int=6) -> Iterator[str]:
+    """Day 25: a Turing machine blueprint with ``num_states`` states running for ``size`` steps."""
+    states = string.ascii_uppercase[:num_states]
+    yield 'Begin in state A.\n'
+    yield 'Perform a diagnostic checksum after {} steps.\n'.format(size)
+    for state in states:
+        yield '\nIn state {}:\n'.format(state)
+        for value in [0, 1]:
+            yield '  If the current value is {}:\n'.format(value)
+            yield '    - Write the value {}.\n'.format(rng.randint(0, 1))
+            yield '    - Move one slot to the {}.\n'.format(rng.choice(['left', 'right']))
+            yield '    - Continue with state {}.\n'.format(rng.choice(states))
+
+
+GENERATORS = {
+    1: captcha,
+    2: spreadsheet,
+    3: spiral,
+    4: passphrases,
+    5: jumps,
+    6: banks,
+    7: tower,
+    8: registers,
+    9: stream,
+    10: knot_lengths,
+    11: hex_path,
+    12: pipes,
+    13: firewall,
+    14: disk_key,
+    15: judge_generators,
+    16: dance,
+    17: spinlock,
+    18: duet,
+    19: tubes,
+    20: particles,
+    21: rules,
+    22: virus_grid,
+    23: coprocessor,
+    24: components,
+    25: blueprint
+}  # type: Dict[int, Generator]
+
+
+def generate(day: int, size: int, seed: int=0) -> Iterator[str]:
+    """
+    Generate an input for a day.
+
+    :param day: the puzzle day, 1 to 25
+    :param size: the size of the input, as described by the day's generator
+    :param seed: the random seed; the same day, size and seed always give the same input
+
+    :return: the input text, in chunks
+    """
+    if day not in GENERATORS:
+        raise ValueError('No generator for day {}'.format(day))
+    return GENERATORS[day](size, random.Random(seed))
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.generate', description=__doc__.split('\n\n')[0])
+    parser.add_argument('day', type=int)
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write to (defaults to stdout)')
+    args = parser.parse_args(argv)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for chunk in generate(args.day, args.size, args.seed):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsGenerate(unittest.TestCase):
+    def _solve(self, key: str, text: str):
+        solver = SOLVERS[key]
+        module = load_module(solver)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'input.txt')
+            with open(path, 'w') as f:
+                f.write(text)
+            args = solver.parse(module, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return solver.solve(module, *args)
+
+    def _gen(self, day: int, size: int, seed: int=0) -> str:
+        return ''.join(generate(day, size, seed))
+
+    def test_deterministic(self):
+        for day in GENERATORS:
+            self.assertEqual(self._gen(day, 20, 1), self._gen(day, 20, 1))
+
+    def test_seeded(self):
+        self.assertNotEqual(self._gen(1, 100, 1), self._gen(1, 100, 2))
+
+    def test_captcha(self):
+        self.assertEqual(1001, len(self._gen(1, 1000)))
+
+    def test_solvable(self):
+        for key, day, size in [('011', 1, 100), ('022', 2, 50), ('042', 4, 100), ('052', 5, 100),
+                               ('062', 6, 8), ('072', 7, 200), ('082', 8, 200), ('092', 9, 2000),
+                               ('102', 10, 20), ('112', 11, 500), ('122', 12, 500), ('132', 13, 20),
+                               ('162', 16, 100), ('181', 18, 5), ('192', 19, 300), ('201', 20, 100),
+                               ('211', 21, 0), ('221', 22, 9), ('231', 23, 10), ('241', 24, 10)]:
+            for seed in range(3):
+                with self.subTest(key=key, seed=seed):
+                    self.assertIsNotNone(self._solve(key, self._gen(day, size, seed)))
+
+    def test_tower_single_unbalanced(self):
+        for seed in range(5):
+            name, weight = self._solve('072', self._gen(7, 100, seed))
+            self.assertGreater(weight, 0)
+
+    def test_tubes_letters(self):
+        text = self._gen(19, 300)
+        self.assertEqual(sum(1 for x in text if x.isupper()), len(self._solve('191', text)))
+
+    def test_rules_complete(self):
+        self.assertEqual(6 + 102, len(self._gen(21, 0).splitlines()))
@@ -0,0 +1,261 @@
+"""
+Low-overhead instrumentation for the solvers' hot loops: named counters, timers and sampled progress.
+
+Instrumentation is off by default.  While off, :func:`counter` and :func:`timer` hand back shared
+objects whose methods do nothing, and :func:`progress` returns the iterable it was given untouched,
+so an instrumented loop runs exactly as an uninstrumented one.  Metrics are looked up when a solver
+starts, so enabling instrumentation takes effect from the next call.
+
+Instrumentation is turned on with :func:`enable`, or for a script run by setting
+``ADVENT_INSTRUMENT=1``; ``ADVENT_METRICS=FILE`` additionally writes the metrics when the script
+exits, in Prometheus text format if ``FILE`` ends in ``.prom`` and as JSON otherwise.
+"""
+import atexit
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import unittest
+
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str, int, Optional[int], float], None]
+
+
+class Counter(object):
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int=1):
+        self.value += amount
+
+
+class Timer(object):
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._start = None  # type: float
+
+    def __enter__(self) -> 'Timer':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+class _NullCounter(object):
+    def inc(self, amount: int=1):
+        pass
+
+
+class _NullTimer(object):
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_COUNTER = _NullCounter()
+_NULL_TIMER = _NullTimer()
+
+
+def log_progress(name: str, done: int, total: Optional[int], elapsed: float):
+    logger.info('%s: %s%s after %.3fs', name, done, '' if total is None else ' of {}'.format(total), elapsed)
+
+
+class Registry(object):
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}  # type: Dict[str, Counter]
+        self.timers = {}  # type: Dict[str, Timer]
+        self.progress = {}  # type: Dict[str, int]
+        self.callbacks = [log_progress]  # type: List[ProgressCallback]
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+        self.progress.clear()
+
+
+_REGISTRY = Registry()
+
+
+def enable(enabled: bool=True):
+    _REGISTRY.enabled = enabled
+
+
+def disable():
+    enable(False)
+
+
+def is_enabled() -> bool:
+    return _REGISTRY.enabled
+
+
+def reset():
+    """Discard every recorded metric."""
+    _REGISTRY.reset()
+
+
+def on_progress(callback: ProgressCallback):
+    """Register a callback for sampled progress, in addition to the default of logging it."""
+    _REGISTRY.callbacks += [callback]
+
+
+def counter(name: str) -> Counter:
+    if not _REGISTRY.enabled:
+        return _NULL_COUNTER
+    return _REGISTRY.counters.setdefault(name, Counter())
+
+
+def timer(name: str) -> Timer:
+    """
+    :return: a context manager adding the time spent inside it to the named timer
+    """
+    if not _REGISTRY.enabled:
+        return _NULL_TIMER
+    return _REGISTRY.timers.setdefault(name, Timer())
+
+
+def progress(items: Iterable, name: str, every: int, total: int=None) -> Iterable:
+    """
+    Report progress through a loop every ``every`` items.
+
+    :param items: the loop's iterable; returned as-is when instrumentation is disabled
+    :param name: the name progress is reported under
+    :param every: how many items pass between reports
+    :param total: the expected number of items, if known
+    """
+    if not _REGISTRY.enabled:
+        return items
+    return _sampled(items, name, every, total)
+
+
+def _sampled(items: Iterable, name: str, every: int, total: Optional[int]) -> Iterator:
+    start = time.perf_counter()
+    done = 0
+    try:
+        for item in items:
+            yield item
+            done += 1
+            if done % every == 0:
+                _REGISTRY.progress[name] = done
+                for callback in _REGISTRY.callbacks:
+                    callback(name, done, total, time.perf_counter() - start)
+    finally:
+        _REGISTRY.progress[name] = done
+
+
+def snapshot() -> Dict[str, Any]:
+    return {
+        'counters': {k: v.value for k, v in sorted(_REGISTRY.counters.items())},
+        'timers': {k: {'count': v.count, 'total': v.total, 'max': v.max}
+                   for k, v in sorted(_REGISTRY.timers.items())},
+        'progress': dict(sorted(_REGISTRY.progress.items()))
+    }
+
+
+def to_json() -> str:
+    return json.dumps(snapshot(), indent=2)
+
+
+def _metric_name(name: str) -> str:
+    return 'advent_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def to_prometheus() -> str:
+    """
+    :return: the metrics in the Prometheus text exposition format
+    """
+    out = []  # type: List[str]
+    snap = snapshot()
+    for name, value in snap['counters'].items():
+        metric = _metric_name(name) + '_total'
+        out += ['# TYPE {} counter'.format(metric), '{} {}'.format(metric, value)]
+    for name, timer_snap in snap['timers'].items():
+        metric = _metric_name(name) + '_seconds'
+        out += ['# TYPE {} summary'.format(metric),
+                '{}_count {}'.format(metric, timer_snap['count']),
+                '{}_sum {}'.format(metric, timer_snap['total']),
+                '# TYPE {}_max gauge'.format(metric),
+                '{}_max {}'.format(metric, timer_snap['max'])]
+    for name, value in snap['progress'].items():
+        metric = _metric_name(name) + '_progress'
+        out += ['# TYPE {} gauge'.format(metric), '{} {}'.format(metric, value)]
+    return '\n'.join(out) + '\n'
+
+
+def _write_metrics(path: str):
+    with open(path, 'w') as f:
+        f.write(to_prometheus() if path.endswith('.prom') else to_json())
+
+
+if os.environ.get('ADVENT_INSTRUMENT', '') not in ('', '0'):
+    enable()
+    if os.environ.get('ADVENT_METRICS'):
+        atexit.register(_write_metrics, os.environ['ADVENT_METRICS'])
+
+
+class TestsInstrument(unittest.TestCase):
+    def setUp(self):
+        self._was_enabled = is_enabled()
+        self._callbacks = list(_REGISTRY.callbacks)
+        reset()
+
+    def tearDown(self):
+        enable(self._was_enabled)
+        _REGISTRY.callbacks = self._callbacks
+        reset()
+
+    def test_disabled_is_noop(self):
+        disable()
+        items = range(10)
+        self.assertIs(items, progress(items, 'loop', 2))
+        counter('hits').inc()
+        with timer('step'):
+            pass
+        self.assertEqual({'counters': {}, 'timers': {}, 'progress': {}}, snapshot())
+
+    def test_counter(self):
+        enable()
+        counter('hits').inc()
+        counter('hits').inc(2)
+        self.assertEqual({'hits': 3}, snapshot()['counters'])
+
+    def test_timer(self):
+        enable()
+        for _ in range(2):
+            with timer('step'):
+                pass
+        self.assertEqual(2, snapshot()['timers']['step']['count'])
+
+    def test_progress(self):
+        enable()
+        seen = []
+        _REGISTRY.callbacks = [lambda name, done, total, elapsed: seen.append((name, done, total))]
+        self.assertEqual(list(range(5)), list(progress(range(5), 'loop', 2, 5)))
+        self.assertEqual([('loop', 2, 5), ('loop', 4, 5)], seen)
+        self.assertEqual({'loop': 5}, snapshot()['progress'])
+
+    def test_prometheus(self):
+        enable()
+        counter('spinlock.zero_moves').inc(4)
+        with timer('enhance'):
+            pass
+        text = to_prometheus()
+        self.assertIn('# TYPE advent_spinlock_zero_moves_total counter\nadvent_spinlock_zero_moves_total 4\n', text)
+        self.assertIn('advent_enhance_seconds_count 1\n', text)
+
+    def test_json(self):
+        enable()
+        counter('hits').inc()
+        self.assertEqual({'hits': 1}, json.loads(to_json())['counters'])
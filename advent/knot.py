@@ -0,0 +1,109 @@
+"""
+The knot hash from day 10, as used by day 14 to build its disk grid.
+
+The ring of marks is a ``bytearray`` reversed in place, slice by slice, and :func:`hash_many`
+hashes a batch of keys, optionally across a process pool for grids of thousands of rows.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import xor
+import os
+from typing import Iterable, List
+import unittest
+
+
+SIZE = 256
+ROUNDS = 64
+SUFFIX = [17, 31, 73, 47, 23]
+
+
+def reverse(ring: bytearray, start: int, length: int):
+    """
+    Reverse ``length`` marks of the ring in place, starting at ``start`` and wrapping around the end.
+    """
+    end = start + length
+    if end <= len(ring):
+        ring[start:end] = ring[start:end][::-1]
+    else:
+        end -= len(ring)
+        marks = (ring[start:] + ring[:end])[::-1]
+        ring[start:] = marks[:len(ring) - start]
+        ring[:end] = marks[len(ring) - start:]
+
+
+def sparse_hash(lengths: List[int], rounds: int=ROUNDS, size: int=SIZE) -> bytearray:
+    """
+    :param lengths: the lengths to twist the ring by, in order, each round
+    :param rounds: the number of rounds, keeping the position and skip size between them
+    :param size: the number of marks on the ring, at most 256
+
+    :return: the ring after the final round
+    """
+    ring = bytearray(range(size))
+    pos = 0
+    skip = 0
+    for _ in range(rounds):
+        for length in lengths:
+            reverse(ring, pos, length)
+            pos = (pos + length + skip) % size
+            skip += 1
+    return ring
+
+
+def dense_hash(ring: bytearray) -> bytes:
+    return bytes(reduce(xor, ring[i:i + 16]) for i in range(0, len(ring), 16))
+
+
+def hash(key: str) -> str:
+    """
+    :return: the knot hash of ``key`` as 32 hex digits
+    """
+    return dense_hash(sparse_hash([ord(x) for x in key] + SUFFIX)).hex()
+
+
+def hash_many(keys: Iterable[str], jobs: int=1) -> List[str]:
+    """
+    Knot hash a batch of keys.
+
+    :param keys: the keys to hash
+    :param jobs: the number of processes to hash across, 0 for one per CPU; with 1 the keys are
+        hashed in this process
+
+    :return: the hash of each key, in order
+    """
+    keys = list(keys)
+    if jobs == 0:
+        jobs = os.cpu_count()
+    if jobs == 1 or len(keys) < 2:
+        return [hash(x) for x in keys]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(hash, keys, chunksize=max(1, len(keys) // (jobs * 4))))
+
+
+class TestsKnot(unittest.TestCase):
+    def test_reverse(self):
+        ring = bytearray([0, 1, 2, 3, 4])
+        reverse(ring, 0, 3)
+        self.assertEqual(bytearray([2, 1, 0, 3, 4]), ring)
+        reverse(ring, 3, 4)
+        self.assertEqual(bytearray([4, 3, 0, 1, 2]), ring)
+        reverse(ring, 1, 5)
+        self.assertEqual(bytearray([3, 4, 2, 1, 0]), ring)
+
+    def test_sparse_hash(self):
+        self.assertEqual(bytearray([3, 4, 2, 1, 0]), sparse_hash([3, 4, 1, 5], rounds=1, size=5))
+
+    def test_dense_hash(self):
+        self.assertEqual(bytes([64]), dense_hash(bytearray([65, 27, 9, 1, 4, 3, 40, 50, 91, 7, 6, 0, 2, 5, 68, 22])))
+
+    def test_hash(self):
+        self.assertEqual('a2582a3a0e66e6e86e3812dcb672a272', hash(''))
+        self.assertEqual('33efeb34ea91902bb2f59c9920caa6cd', hash('AoC 2017'))
+        self.assertEqual('3efbe78a8d82f29979031a4aa0b16a9d', hash('1,2,3'))
+        self.assertEqual('63960835bcdc130f0b66d7ff4f6a5a8e', hash('1,2,4'))
+
+    def test_hash_many(self):
+        keys = ['flqrgnkx-{}'.format(i) for i in range(8)]
+        expected = [hash(x) for x in keys]
+        self.assertEqual(expected, hash_many(keys))
+        self.assertEqual(expected, hash_many(keys, jobs=2))
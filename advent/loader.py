@@ -0,0 +1,244 @@
+"""
+Memory-mapped puzzle input.
+
+The day scripts read their input through :func:`load`, which, like ``fileinput``, takes the file
+named on the command line or falls back to stdin.  Files are memory-mapped rather than read, and
+lines and comma-separated tokens are decoded one at a time from the mapping, so multi-gigabyte
+inputs are never held as a list of strings.  :func:`map_ranges` splits a file into ranges of whole
+lines and processes each in a worker process.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+import sys
+import tempfile
+from typing import Any, Callable, Iterator, List, Tuple, Union
+import unittest
+
+
+class Input(object):
+    def __init__(self, path: str=None):
+        """
+        :param path: the file to map; stdin is read into memory instead if not given, as pipes
+            cannot be mapped
+        """
+        self._mmap = None  # type: mmap.mmap
+        if path is None or path == '-':
+            self._buf = sys.stdin.buffer.read()  # type: Union[bytes, mmap.mmap]
+        elif os.path.getsize(path) == 0:
+            self._buf = b''
+        else:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buf = self._mmap
+        self._view = memoryview(self._buf)
+
+    def view(self) -> memoryview:
+        """
+        :return: the raw bytes of the input, without copying them
+        """
+        return self._view
+
+    def text(self) -> str:
+        """
+        :return: the whole input as a single string
+        """
+        return str(self._view, 'utf-8')
+
+    def lines(self, start: int=0, end: int=None) -> Iterator[str]:
+        """
+        :param start: the byte offset to start at, which should be the start of a line
+        :param end: the byte offset to stop at, which should be the end of a line; defaults to the
+            end of the input
+
+        :return: each line of the input, with trailing whitespace removed
+        """
+        if end is None:
+            end = len(self._buf)
+        while start < end:
+            nl = self._buf.find(b'\n', start, end)
+            if nl == -1:
+                nl = end
+            yield str(self._view[start:nl], 'utf-8').rstrip()
+            start = nl + 1
+
+    def tokens(self, sep: str=',') -> Iterator[str]:
+        """
+        :param sep: the separator between tokens
+
+        :return: each token of the input, with surrounding whitespace removed
+        """
+        needle = sep.encode()
+        start = 0
+        end = len(self._buf)
+        while start < end:
+            idx = self._buf.find(needle, start)
+            if idx == -1:
+                idx = end
+            token = str(self._view[start:idx], 'utf-8').strip()
+            if token != '' or idx != end:
+                yield token
+            start = idx + len(needle)
+
+    def ranges(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Split the input into about ``count`` byte ranges of similar size, each of whole lines.
+
+        :return: the ``(start, end)`` offsets of each non-empty range, in order
+        """
+        size = len(self._buf)
+        bounds = [0]
+        for i in range(1, count):
+            nl = self._buf.find(b'\n', max(size * i // count - 1, bounds[-1]))
+            if nl == -1:
+                break
+            if nl + 1 > bounds[-1]:
+                bounds += [nl + 1]
+        if bounds[-1] < size:
+            bounds += [size]
+        return list(zip(bounds, bounds[1:]))
+
+    def blocks(self, block_size: int, start: int=0, end: int=None) -> Iterator[memoryview]:
+        """
+        :param block_size: the approximate size of each block in bytes
+        :param start: the byte offset to start at, which should be the start of a line
+        :param end: the byte offset to stop at, which should be the end of a line; defaults to the
+            end of the input
+
+        :return: the raw input in consecutive blocks, each ending at the end of a line
+        """
+        if end is None:
+            end = len(self._buf)
+        while start < end:
+            nl = self._buf.find(b'\n', min(start + block_size, end) - 1)
+            nl = end if nl == -1 else nl + 1
+            yield self._view[start:nl]
+            start = nl
+
+    def close(self):
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> 'Input':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(args: List[str]=None) -> Input:
+    """
+    Open the puzzle input named on the command line, or stdin if there is none.
+
+    :param args: the command line arguments, defaulting to ``sys.argv[1:]``
+    """
+    if args is None:
+        args = sys.argv[1:]
+    return Input(args[0] if len(args) > 0 else None)
+
+
+def _map_range(path: str, fn: Callable[..., Any], start: int, end: int, args: Tuple) -> Any:
+    with Input(path) as inp:
+        return fn(inp, start, end, *args)
+
+
+def map_ranges(path: str, fn: Callable[..., Any], jobs: int=0, shards: int=None, *args) -> List[Any]:
+    """
+    Process a file across a process pool, each worker handling a range of whole lines.
+
+    :param path: the file, which each worker maps for itself
+    :param fn: called as ``fn(inp, start, end, *args)`` with the worker's :class:`Input` and the byte
+        offsets of its range; it must be a module-level function so it can be sent to the workers
+    :param jobs: the number of worker processes, 0 for one per CPU
+    :param shards: the number of ranges to split the file into, by default four per worker so
+        workers finishing early can pick up more
+    :param args: further arguments to ``fn``, which must be picklable
+
+    :return: the result of ``fn`` for each range, in file order
+    """
+    if jobs == 0:
+        jobs = os.cpu_count()
+    with Input(path) as inp:
+        ranges = inp.ranges(shards or jobs * 4)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_map_range, path, fn, start, end, args) for start, end in ranges]
+        return [x.result() for x in futures]
+
+
+class TempInputMixin(object):
+    """
+    Helpers for a :class:`unittest.TestCase` writing input to temporary files, which are removed
+    and unmapped once the test ends.
+    """
+    def _path(self, content: bytes) -> str:
+        tmp = tempfile.NamedTemporaryFile(delete=False)
+        tmp.write(content)
+        tmp.close()
+        self.addCleanup(os.remove, tmp.name)
+        return tmp.name
+
+    def _input(self, content: bytes) -> Input:
+        inp = Input(self._path(content))
+        self.addCleanup(inp.close)
+        return inp
+
+
+class TestsLoader(TempInputMixin, unittest.TestCase):
+    def test_lines(self):
+        self.assertEqual(['a b', '  c', 'd'], list(self._input(b'a b \n  c\nd\n').lines()))
+
+    def test_lines_no_trailing_newline(self):
+        self.assertEqual(['a', 'b'], list(self._input(b'a\nb').lines()))
+
+    def test_lines_blank(self):
+        self.assertEqual(['a', '', 'b'], list(self._input(b'a\n\nb\n').lines()))
+
+    def test_text(self):
+        self.assertEqual('{<a>}\n', self._input(b'{<a>}\n').text())
+
+    def test_view(self):
+        self.assertEqual(b'123', self._input(b'123').view().tobytes())
+
+    def test_tokens(self):
+        self.assertEqual(['se', 'n', 'nw'], list(self._input(b'se,n,nw\n').tokens()))
+
+    def test_tokens_sep(self):
+        self.assertEqual(['1', '2', '3'], list(self._input(b'1 <-> 2 <-> 3').tokens('<->')))
+
+    def test_lines_range(self):
+        self.assertEqual(['b', 'c'], list(self._input(b'a\nb\nc\nd\n').lines(2, 6)))
+
+    def test_ranges(self):
+        inp = self._input(b'a\nbb\nccc\ndddd\n')
+        self.assertEqual([(0, 14)], inp.ranges(1))
+        self.assertEqual([(0, 9), (9, 14)], inp.ranges(2))
+        self.assertEqual([(0, 2), (2, 5), (5, 9), (9, 14)], inp.ranges(15))
+        self.assertEqual(['a', 'bb', 'ccc', 'dddd'], [x for s, e in inp.ranges(3) for x in inp.lines(s, e)])
+
+    def test_ranges_no_trailing_newline(self):
+        self.assertEqual([(0, 4), (4, 7)], self._input(b'aaa\nbbb').ranges(2))
+
+    def test_blocks(self):
+        inp = self._input(b'5 1 9 5\n7 5 3\n2 4 6 8')
+        self.assertEqual([b'5 1 9 5\n', b'7 5 3\n', b'2 4 6 8'], [x.tobytes() for x in inp.blocks(1)])
+        self.assertEqual([b'5 1 9 5\n7 5 3\n', b'2 4 6 8'], [x.tobytes() for x in inp.blocks(9)])
+        self.assertEqual([b'7 5 3\n'], [x.tobytes() for x in inp.blocks(100, 8, 14)])
+
+    def test_empty(self):
+        inp = self._input(b'')
+        self.assertEqual([], list(inp.lines()))
+        self.assertEqual([], list(inp.tokens()))
+        self.assertEqual([], list(inp.blocks(10)))
+        self.assertEqual([], inp.ranges(4))
+
+    @staticmethod
+    def _range_lines(inp: Input, start: int, end: int, suffix: str) -> List[str]:
+        return [x + suffix for x in inp.lines(start, end)]
+
+    def test_map_ranges(self):
+        path = self._path(b'a\nbb\nccc\ndddd\n')
+        for shards in [1, 2, 3, 100]:
+            self.assertEqual(['a!', 'bb!', 'ccc!', 'dddd!'],
+                             [x for xs in map_ranges(path, self._range_lines, 2, shards, '!') for x in xs])
+        self.assertEqual([], map_ranges(self._path(b''), self._range_lines, 1, None, '!'))
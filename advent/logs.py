@@ -0,0 +1,58 @@
+"""
+Logging setup for the day scripts.
+
+The day modules only create their loggers when imported.  Handlers and levels are set up by
+:func:`configure`, called from each script's ``__main__`` block, so importing a solver from the
+runner, the benchmarks or the tests leaves the root logger alone.
+
+Set ``ADVENT_QUIET=1`` to run a script in quiet mode.  Only warnings are logged, and the solvers
+check the level once before their hot loops, so they skip their per-step trace logging altogether.
+"""
+import logging
+import os
+import unittest
+
+
+def quiet() -> bool:
+    return os.environ.get('ADVENT_QUIET', '') not in ('', '0')
+
+
+def configure(level: int=None):
+    """
+    :param level: the root logging level, defaulting to INFO, or WARNING in quiet mode
+    """
+    if level is None:
+        level = logging.WARNING if quiet() else logging.INFO
+    logging.basicConfig(level=level)
+
+
+class TestsLogs(unittest.TestCase):
+    def setUp(self):
+        self._env = os.environ.get('ADVENT_QUIET')
+        root = logging.getLogger()
+        self._root = root.level, root.handlers
+        root.handlers = []
+
+    def tearDown(self):
+        if self._env is None:
+            os.environ.pop('ADVENT_QUIET', None)
+        else:
+            os.environ['ADVENT_QUIET'] = self._env
+        root = logging.getLogger()
+        root.level, root.handlers = self._root
+
+    def test_quiet(self):
+        os.environ['ADVENT_QUIET'] = '1'
+        self.assertTrue(quiet())
+        os.environ['ADVENT_QUIET'] = '0'
+        self.assertFalse(quiet())
+
+    def test_configure(self):
+        os.environ['ADVENT_QUIET'] = '1'
+        configure()
+        self.assertEqual(logging.WARNING, logging.getLogger().level)
+
+    def test_configure_verbose(self):
+        os.environ.pop('ADVENT_QUIET', None)
+        configure()
+        self.assertEqual(logging.INFO, logging.getLogger().level)
@@ -0,0 +1,329 @@
+"""
+The jump maze from day 5.
+
+The offsets are held in an ``array('i')``.  Under part 2's rule every offset of 2 or 3 flips to the
+other each time it is jumped from, and the jumps from them only go forwards, so a prefix of the maze
+settles into 2s and 3s that the program crosses again and again.  Once eight consecutive offsets
+have settled they are held as a byte, one bit per offset, and the program crosses the whole group in
+a single lookup in a table of every group's exit, step count and flipped bits.
+
+Long runs can be checkpointed: :meth:`Maze.save` writes the program counter, step count and offsets
+to a small binary file, :func:`restore` reads one back, and :func:`run_checkpointed` runs a maze to
+the end, saving it every so many steps.
+
+Usage, from the repository root::
+
+    python -m advent.maze [--strange] [--checkpoint FILE [--every N]] [MAZE]
+
+resumes from the checkpoint ``FILE`` if it exists, and otherwise starts the maze read from ``MAZE``
+or stdin.
+"""
+import argparse
+from array import array
+from functools import lru_cache
+import os
+import random
+import struct
+import sys
+import tempfile
+from typing import Iterable, List, Tuple
+import unittest
+
+from advent.loader import load
+
+
+CHUNK_BITS = 3
+CHUNK = 1 << CHUNK_BITS
+
+CHECKPOINT_STEPS = 10 ** 8
+
+# magic, whether the maze is strange, program counter, steps taken and number of offsets, followed by
+# the offsets as little-endian 32-bit integers
+_HEADER = struct.Struct('<4s?qqq')
+_MAGIC = b'JMP1'
+
+# no limit on the steps taken by a single run
+_FOREVER = 1 << 62
+
+# (bits, exit, steps) for each (bits << CHUNK_BITS | entry)
+Transit = Tuple[int, int, int]
+
+
+def _transit(bits: int, pos: int) -> Transit:
+    """
+    Cross a group of settled offsets.
+
+    :param bits: the group's offsets, with bit ``i`` set where offset ``i`` is 3 rather than 2
+    :param pos: the offset in the group to start from
+
+    :return: the group's offsets afterwards, how far past the group's end the program lands and the
+        number of steps taken
+    """
+    steps = 0
+    while pos < CHUNK:
+        if bits >> pos & 1:
+            bits ^= 1 << pos
+            pos += 3
+        else:
+            bits |= 1 << pos
+            pos += 2
+        steps += 1
+    return bits, pos - CHUNK, steps
+
+
+@lru_cache(maxsize=None)
+def _transits() -> List[Transit]:
+    return [_transit(x >> CHUNK_BITS, x & (CHUNK - 1)) for x in range(1 << (CHUNK + CHUNK_BITS))]
+
+
+def _settle(offsets: array, groups: List[int], limit: int) -> int:
+    """
+    Add the groups of offsets from ``limit`` on that have settled to ``groups``.
+
+    :return: the end of the last settled group
+    """
+    while limit + CHUNK <= len(offsets):
+        group = offsets[limit:limit + CHUNK]
+        if min(group) < 2 or max(group) > 3:
+            break
+        groups.append(sum(1 << i for i, x in enumerate(group) if x == 3))
+        limit += CHUNK
+    return limit
+
+
+class Maze(object):
+    def __init__(self, offsets: Iterable[int], strange: bool=False):
+        """
+        :param offsets: the jump offsets
+        :param strange: whether offsets of 3 or more are decremented after each jump (part 2)
+            rather than all being incremented (part 1)
+        """
+        self.offsets = array('i', offsets)
+        self.strange = strange
+        self.pc = 0
+        self.steps = 0
+
+    def halted(self) -> bool:
+        return not 0 <= self.pc < len(self.offsets)
+
+    def run(self, limit: int=None) -> int:
+        """
+        Jump until the program leaves the maze.
+
+        :param limit: stop once at least this many more steps have been taken, though part 2 may
+            take a few more to finish crossing the settled offsets
+
+        :return: the total number of steps taken
+        """
+        stop = self.steps + limit if limit is not None else _FOREVER
+        if self.strange:
+            self._run_strange(stop)
+        else:
+            self._run(stop)
+        return self.steps
+
+    def save(self, path: str):
+        """
+        Write a checkpoint of the maze, replacing any earlier one only once it is complete.
+        """
+        offsets = array('i', self.offsets)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.strange, self.pc, self.steps, len(offsets)))
+            offsets.tofile(f)
+        os.replace(tmp, path)
+
+    def _run(self, stop: int):
+        # part 1's offsets grow large, and a list holds them without boxing each one read
+        offsets = self.offsets.tolist()
+        n = len(offsets)
+        pc = self.pc
+        steps = self.steps
+        while 0 <= pc < n and steps < stop:
+            dist = offsets[pc]
+            offsets[pc] = dist + 1
+            pc += dist
+            steps += 1
+        self.offsets = array('i', offsets)
+        self.pc = pc
+        self.steps = steps
+
+    def _run_strange(self, stop: int):
+        offsets = self.offsets
+        n = len(offsets)
+        pc = self.pc
+        steps = self.steps
+        transits = _transits()
+        # the settled groups, from the start of the maze up to limit
+        groups = []  # type: List[int]
+        limit = _settle(offsets, groups, 0)
+        while 0 <= pc < n and steps < stop:
+            if pc < limit:
+                group = pc >> CHUNK_BITS
+                pos = pc & (CHUNK - 1)
+                settled = len(groups)
+                while group < settled:
+                    groups[group], pos, count = transits[groups[group] << CHUNK_BITS | pos]
+                    steps += count
+                    group += 1
+                pc = (group << CHUNK_BITS) + pos
+                continue
+
+            dist = offsets[pc]
+            offsets[pc] = dist - 1 if dist >= 3 else dist + 1
+            if pc < limit + CHUNK:
+                # the first unsettled group may just have settled, and the ones after it with it
+                limit = _settle(offsets, groups, limit)
+            pc += dist
+            steps += 1
+
+        for i, bits in enumerate(groups):
+            offsets[i << CHUNK_BITS:(i + 1) << CHUNK_BITS] = array('i', (2 + (bits >> x & 1) for x in range(CHUNK)))
+        self.pc = pc
+        self.steps = steps
+
+
+def restore(path: str) -> Maze:
+    """
+    Read a maze back from a checkpoint written by :meth:`Maze.save`.
+    """
+    with open(path, 'rb') as f:
+        magic, strange, pc, steps, n = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError('Not a maze checkpoint: {}'.format(path))
+        offsets = array('i')
+        try:
+            offsets.fromfile(f, n)
+        except EOFError:
+            raise ValueError('Truncated maze checkpoint: {}'.format(path))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    maze = Maze([], strange)
+    maze.offsets = offsets
+    maze.pc = pc
+    maze.steps = steps
+    return maze
+
+
+def run_checkpointed(maze: Maze, path: str, every: int=CHECKPOINT_STEPS) -> int:
+    """
+    Run a maze to the end, saving a checkpoint every ``every`` steps and once it has finished.
+
+    :return: the total number of steps taken
+    """
+    while not maze.halted():
+        maze.run(every)
+        maze.save(path)
+    return maze.steps
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.maze', description=__doc__.split('\n\n')[0])
+    parser.add_argument('file', nargs='?', help='the jump offsets, one per line; defaults to stdin')
+    parser.add_argument('--strange', action='store_true',
+                        help='decrement offsets of 3 or more after jumping (part 2)')
+    parser.add_argument('--checkpoint', help='save progress to this file, resuming from it if it exists')
+    parser.add_argument('--every', type=int, default=CHECKPOINT_STEPS, help='steps between checkpoints')
+    args = parser.parse_args(argv)
+
+    if args.checkpoint is not None and os.path.exists(args.checkpoint):
+        maze = restore(args.checkpoint)
+    else:
+        with load([args.file] if args.file is not None else []) as inp:
+            maze = Maze((int(x) for x in inp.lines() if x != ''), args.strange)
+    if args.checkpoint is not None:
+        print(run_checkpointed(maze, args.checkpoint, args.every))
+    else:
+        print(maze.run())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsMaze(unittest.TestCase):
+    def _reference(self, offsets: List[int], strange: bool) -> int:
+        steps = 0
+        pc = 0
+        while 0 <= pc < len(offsets):
+            dist = offsets[pc]
+            offsets[pc] += -1 if strange and dist >= 3 else 1
+            pc += dist
+            steps += 1
+        return steps
+
+    def test_run(self):
+        self.assertEqual(5, Maze([0, 3, 0, 1, -3]).run())
+        self.assertEqual(10, Maze([0, 3, 0, 1, -3], strange=True).run())
+
+    def test_run_offsets(self):
+        maze = Maze([0, 3, 0, 1, -3], strange=True)
+        maze.run()
+        self.assertEqual(array('i', [2, 3, 2, 3, -1]), maze.offsets)
+        self.assertTrue(maze.halted())
+
+    def test_transit(self):
+        self.assertEqual((0b0101_0101, 0, 4), _transit(0, 0))
+        self.assertEqual((0b1101_0000, 0, 3), _transit(0b1000_0010, 1))
+        self.assertEqual((0, 2, 1), _transit(0b1000_0000, 7))
+        self.assertEqual((0, 0, 0), _transit(0, CHUNK))
+
+    def test_matches_reference(self):
+        rng = random.Random(0)
+        for size in [1, 7, 8, 9, 100, 500]:
+            for strange in [False, True]:
+                offsets = [rng.randint(-i, 2) for i in range(size)]
+                maze = Maze(offsets, strange)
+                self.assertEqual(self._reference(offsets, strange), maze.run())
+                self.assertEqual(array('i', offsets), maze.offsets)
+
+    def test_run_limit(self):
+        for strange in [False, True]:
+            maze = Maze([0, 3, 0, 1, -3], strange)
+            self.assertEqual(3, maze.run(3))
+            self.assertFalse(maze.halted())
+            self.assertEqual(Maze([0, 3, 0, 1, -3], strange).run(), maze.run())
+
+    def test_save_restore(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'maze.ckpt')
+        rng = random.Random(0)
+        offsets = [rng.randint(-i, 2) for i in range(300)]
+        for strange in [False, True]:
+            expected = Maze(offsets, strange).run()
+            maze = Maze(offsets, strange)
+            maze.run(1_000)
+            maze.save(path)
+            resumed = restore(path)
+            self.assertEqual((maze.offsets, maze.pc, maze.steps, strange),
+                             (resumed.offsets, resumed.pc, resumed.steps, resumed.strange))
+            self.assertEqual(expected, resumed.run())
+
+    def test_run_checkpointed(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'maze.ckpt')
+        self.assertEqual(10, run_checkpointed(Maze([0, 3, 0, 1, -3], True), path, every=2))
+        self.assertEqual((10, True), (restore(path).steps, restore(path).halted()))
+
+    def test_restore_invalid(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'maze.ckpt')
+        Maze([1, 2, 3]).save(path)
+        with open(path, 'r+b') as f:
+            f.truncate(_HEADER.size + 4)
+        with self.assertRaises(ValueError):
+            restore(path)
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            restore(path)
+
+    def test_backwards_exit(self):
+        self.assertEqual(2, Maze([1, -5]).run())
+        self.assertEqual(2, Maze([1, -5], strange=True).run())
@@ -0,0 +1,157 @@
+"""
+Passphrase validation (day 4) over files of tens of millions of passphrases.
+
+A passphrase is checked by a policy, a function from the passphrase to whether it is valid:
+:func:`no_duplicates` for part 1 and :func:`no_anagrams` for part 2, which compares each word's
+letters sorted into a string rather than counting them.  :func:`tally` validates a whole input in
+one pass, decoding it a block of lines at a time rather than line by line, and
+:func:`tally_sharded` tallies ranges of whole lines of a file in worker processes.
+
+Usage, from the repository root::
+
+    python -m advent.passphrase [--anagrams] [--jobs N] [--throughput] [FILE]
+"""
+import argparse
+import sys
+import time
+from typing import Callable, List, Tuple
+import unittest
+
+from advent.loader import Input, TempInputMixin, load, map_ranges
+
+
+BLOCK_SIZE = 1 << 22
+
+Policy = Callable[[str], bool]
+
+
+def anagram_key(word: str) -> str:
+    """
+    :return: the letters of the word in sorted order, which is the same for all its anagrams
+    """
+    return ''.join(sorted(word))
+
+
+def no_duplicates(passphrase: str) -> bool:
+    words = passphrase.split()
+    return len(set(words)) == len(words)
+
+
+def no_anagrams(passphrase: str) -> bool:
+    words = passphrase.split()
+    # words of different lengths cannot be anagrams, so most passphrases need no sorting at all
+    if len(set(map(len, words))) == len(words):
+        return True
+    return len(set(map(anagram_key, words))) == len(words)
+
+
+def tally(inp: Input,
+          policy: Policy=no_duplicates,
+          block_size: int=BLOCK_SIZE,
+          start: int=0,
+          end: int=None) -> Tuple[int, int]:
+    """
+    :param inp: the passphrases, one per line; blank lines are skipped
+    :param policy: decides whether each passphrase is valid
+    :param block_size: the approximate number of bytes decoded at once
+    :param start: the byte offset to start at, which should be the start of a line
+    :param end: the byte offset to stop at, which should be the end of a line; defaults to the end
+        of the input
+
+    :return: the number of valid passphrases and the number of passphrases
+    """
+    valid = 0
+    total = 0
+    for block in inp.blocks(block_size, start, end):
+        with block:
+            lines = str(block, 'utf-8').split('\n')
+        for line in lines:
+            if line.strip() != '':
+                total += 1
+                if policy(line):
+                    valid += 1
+    return valid, total
+
+
+def _tally_range(inp: Input, start: int, end: int, policy: Policy) -> Tuple[int, int]:
+    return tally(inp, policy, start=start, end=end)
+
+
+def tally_sharded(path: str, policy: Policy=no_duplicates, jobs: int=0, shards: int=None) -> Tuple[int, int]:
+    """
+    Validate a file of passphrases across a process pool with :func:`advent.loader.map_ranges`.
+
+    :param path: the passphrases
+    :param policy: decides whether each passphrase is valid, e.g. :func:`no_duplicates`,
+        :func:`no_anagrams` or any other module-level function, so it can be sent to the workers
+    :param jobs: the number of worker processes, 0 for one per CPU
+    :param shards: the number of ranges to split the file into
+
+    :return: the same as :func:`tally` over the whole file
+    """
+    counts = map_ranges(path, _tally_range, jobs, shards, policy)
+    return sum(x for x, _ in counts), sum(x for _, x in counts)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.passphrase', description=__doc__.split('\n\n')[0])
+    parser.add_argument('file', nargs='?', help='the passphrases; defaults to stdin')
+    parser.add_argument('--anagrams', action='store_true',
+                        help='reject passphrases with anagrams of each other (part 2) rather than repeated words')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='number of processes to shard the file across (0 for one per CPU)')
+    parser.add_argument('--throughput', action='store_true', help='report lines validated per second on stderr')
+    args = parser.parse_args(argv)
+    policy = no_anagrams if args.anagrams else no_duplicates
+    if args.jobs != 1 and args.file is None:
+        parser.error('--jobs needs a file to shard')
+
+    start = time.perf_counter()
+    if args.jobs != 1:
+        valid, total = tally_sharded(args.file, policy, args.jobs)
+    else:
+        with load([args.file] if args.file is not None else []) as inp:
+            valid, total = tally(inp, policy)
+    elapsed = time.perf_counter() - start
+    print(valid)
+    if args.throughput:
+        print('{} lines in {:.2f}s: {:.0f} lines/s'.format(total, elapsed, total / elapsed if elapsed > 0 else 0),
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsPassphrase(TempInputMixin, unittest.TestCase):
+    def test_anagram_key(self):
+        self.assertEqual('abcde', anagram_key('ecdab'))
+
+    def test_no_duplicates(self):
+        self.assertEqual([True, False, True],
+                         [no_duplicates(x) for x in ['aa bb cc dd ee', 'aa bb cc dd aa', 'aa bb cc dd aaa']])
+
+    def test_no_anagrams(self):
+        self.assertEqual([True, False, True, True, False],
+                         [no_anagrams(x) for x in ['abcde fghij', 'abcde xyz ecdab', 'a ab abc abd abf abj',
+                                                   'iiii oiii ooii oooi oooo', 'oiii ioii iioi iiio']])
+
+    def test_tally(self):
+        inp = self._input(b'aa bb cc\naa bb aa\n\nab ba cc\n')
+        for block_size in [1, 5, BLOCK_SIZE]:
+            self.assertEqual((2, 3), tally(inp, block_size=block_size))
+            self.assertEqual((1, 3), tally(inp, no_anagrams, block_size))
+
+    def test_tally_range(self):
+        inp = self._input(b'aa bb cc\naa bb aa\n\nab ba cc\n')
+        self.assertEqual((0, 1), tally(inp, start=9, end=18))
+
+    def test_tally_sharded(self):
+        path = self._path(b'aa bb cc\naa bb aa\n\nab ba cc\nab cd ef\nxy yx\n')
+        for shards in [1, 2, 5, 100]:
+            self.assertEqual((4, 5), tally_sharded(path, jobs=2, shards=shards))
+            self.assertEqual((2, 5), tally_sharded(path, no_anagrams, 2, shards))
+
+    def test_tally_empty(self):
+        self.assertEqual((0, 0), tally(self._input(b'')))
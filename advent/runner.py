@@ -0,0 +1,473 @@
+"""
+Run the daily solvers against their puzzle input, timing each stage separately.
+
+Every ``NN/main_NNP.py`` module is discovered and paired with a registered :class:`Solver` that
+mirrors the module's ``__main__`` block, split into a parse stage (read ``input.txt`` and build the
+solver's arguments) and a solve stage.  Import, parse and solve times are reported per solver and
+written to a JSON report so timings can be compared across commits.
+
+Usage, from the repository root::
+
+    python -m advent.runner [--report report.json] [--jobs N] [key ...]
+
+where each ``key`` selects solvers by day (``15``) or by module suffix (``152``).  With ``--jobs``
+the solvers are spread across a process pool, longest first according to the timings in the
+previous report, so the wall-clock time approaches that of the slowest single solver.  With
+``--cache`` results are reused from :mod:`advent.cache` while the solver source, the repository
+modules it and the parse stage import, and the input are unchanged, and with ``--instrument`` each
+record carries the solver's :mod:`advent.instrument` metrics.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
+import datetime
+import glob
+import importlib.util
+import io
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+import unittest
+
+from advent import captcha, instrument
+from advent.cache import ResultCache, local_sources
+from advent.loader import Input
+
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_lines(path: str, strip: Callable[[str], str]=str.strip) -> List[str]:
+    with open(path) as f:
+        return [strip(line) for line in f]
+
+
+def read_ints(path: str) -> List[int]:
+    return [int(x) for x in re.findall(r'-?\d+', ' '.join(read_lines(path)))]
+
+
+class Solver(object):
+    def __init__(self,
+                 key: str,
+                 parse: Callable[[ModuleType, str], Tuple],
+                 solve: Callable[..., Any]):
+        """
+        :param key: the module suffix, i.e. the day followed by the part (``'152'``)
+        :param parse: builds the solver's arguments from the module and the input file path
+        :param solve: called with the module and the parsed arguments, returns the answer
+        """
+        self.key = key
+        self.parse = parse
+        self.solve = solve
+
+    @property
+    def day(self) -> int:
+        return int(self.key[:2])
+
+    @property
+    def part(self) -> int:
+        return int(self.key[2:])
+
+    @property
+    def module_name(self) -> str:
+        return 'main_{}'.format(self.key)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(ROOT, self.key[:2], '{}.py'.format(self.module_name))
+
+    @property
+    def input_path(self) -> str:
+        return os.path.join(ROOT, self.key[:2], 'input.txt')
+
+    def __repr__(self):
+        return 'Solver({})'.format(self.key)
+
+
+def _rstripped(path: str) -> List[str]:
+    return read_lines(path, str.rstrip)
+
+
+def _text(path: str) -> str:
+    with Input(path) as inp:
+        return inp.text().strip()
+
+
+def _tokens(path: str) -> List[str]:
+    with Input(path) as inp:
+        return list(inp.tokens())
+
+
+def _digits(path: str) -> Tuple:
+    with Input(path) as inp:
+        return captcha.digits(inp),
+
+
+SOLVERS = {s.key: s for s in [
+    Solver('011', lambda m, p: _digits(p), lambda m, nums: captcha.count(nums)),
+    Solver('012', lambda m, p: _digits(p), lambda m, nums: captcha.halfway(nums)),
+    Solver('021', lambda m, p: (m.parse(read_lines(p)),), lambda m, data: m.checksum(data)),
+    Solver('022', lambda m, p: (m.parse(read_lines(p)),), lambda m, data: m.checksum(data)),
+    Solver('031', lambda m, p: (int(read_lines(p)[0]),), lambda m, idx: m.dist(idx)),
+    Solver('032', lambda m, p: (int(read_lines(p)[0]),), lambda m, num: m.first_larger(num)),
+    Solver('041', lambda m, p: (read_lines(p),), lambda m, lines: m.num_valid(lines)),
+    Solver('042', lambda m, p: (read_lines(p),), lambda m, lines: m.num_valid(lines)),
+    Solver('051', lambda m, p: ([int(x) for x in read_lines(p)],), lambda m, jumps: m.do_jumps(jumps)),
+    Solver('052', lambda m, p: ([int(x) for x in read_lines(p)],), lambda m, jumps: m.do_jumps(jumps)),
+    Solver('061', lambda m, p: ([int(x) for x in read_lines(p)[0].split()],),
+           lambda m, cells: m.rebalance(cells)),
+    Solver('062', lambda m, p: ([int(x) for x in read_lines(p)[0].split()],),
+           lambda m, cells: m.rebalance(cells)),
+    Solver('071', lambda m, p: (m.parse_all(read_lines(p)),), lambda m, progs: m.build_tree(progs).name),
+    Solver('072', lambda m, p: (read_lines(p),), lambda m, lines: m.main(lines)),
+    Solver('081', lambda m, p: (m.parse(read_lines(p)),), lambda m, cmds: max(m.execute(cmds).values())),
+    Solver('082', lambda m, p: (m.parse(read_lines(p)),), lambda m, cmds: m.execute(cmds)[1]),
+    Solver('091', lambda m, p: (_text(p),), lambda m, stream: m.parse(stream)),
+    Solver('092', lambda m, p: (_text(p),), lambda m, stream: m.parse(stream)),
+    Solver('101', lambda m, p: ([int(x) for x in read_lines(p)[0].split(',')],),
+           lambda m, lengths: m.process(lengths)),
+    Solver('102', lambda m, p: (read_lines(p)[0],), lambda m, key: m.hash(key)),
+    Solver('111', lambda m, p: (_tokens(p),), lambda m, path: m.num_steps(path)),
+    Solver('112', lambda m, p: (_tokens(p),), lambda m, path: m.num_steps(path)),
+    Solver('121', lambda m, p: (m.parse_input(read_lines(p)),), lambda m, edges: len(m.visit_nodes(edges, 0))),
+    Solver('122', lambda m, p: (m.parse_input(read_lines(p)),), lambda m, edges: m.count_groups(edges)),
+    Solver('131', lambda m, p: (m.parse(read_lines(p)),), lambda m, firewalls: m.simulate(firewalls)),
+    Solver('132', lambda m, p: (m.parse(read_lines(p)),), lambda m, firewalls: m.simulate(firewalls)),
+    Solver('141', lambda m, p: (read_lines(p)[0],), lambda m, key: m.count_used(m.build_map(key))),
+    Solver('142', lambda m, p: (read_lines(p)[0],), lambda m, key: m.count_regions(m.build_map(key))),
+    Solver('151', lambda m, p: (40_000_000, *read_ints(p)), lambda m, *args: m.score(*args)),
+    Solver('152', lambda m, p: (5_000_000, *read_ints(p)), lambda m, *args: m.score(*args)),
+    Solver('161', lambda m, p: ([m.parse_single(x) for x in _tokens(p)],), lambda m, ops: m.execute(ops)),
+    Solver('162', lambda m, p: ([m.parse_single(x) for x in _tokens(p)],), lambda m, ops: m.execute_all(ops)),
+    Solver('171', lambda m, p: (int(read_lines(p)[0]),), lambda m, rotate: m.get_next(m.spinlock(rotate, 2017))),
+    Solver('172', lambda m, p: (int(read_lines(p)[0]),), lambda m, rotate: m.spinlock(rotate, 50_000_000)),
+    Solver('181', lambda m, p: (m.parse(read_lines(p)),), lambda m, machine: m.recover(machine)),
+    Solver('182', lambda m, p: m.parse(read_lines(p)), lambda m, *progs: m.run(*progs)),
+    Solver('191', lambda m, p: (_rstripped(p),), lambda m, cells: m.traverse(cells, m.find_start(cells[0]), 0)),
+    Solver('192', lambda m, p: (_rstripped(p),), lambda m, cells: m.traverse(cells, m.find_start(cells[0]), 0)),
+    Solver('201', lambda m, p: (m.parse(_rstripped(p)),), lambda m, particles: m.find_min(particles)),
+    Solver('202', lambda m, p: (m.parse(_rstripped(p)),), lambda m, particles: m.collide(particles)),
+    Solver('211', lambda m, p: (_rstripped(p),), lambda m, lines: m.main(lines)),
+    Solver('212', lambda m, p: (_rstripped(p),), lambda m, lines: m.main(lines)),
+    Solver('221', lambda m, p: (m.parse(_rstripped(p)),), lambda m, grid: m.infect(grid)[2]),
+    Solver('222', lambda m, p: (m.parse(_rstripped(p)),), lambda m, grid: m.infect(grid)[2]),
+    Solver('231', lambda m, p: (m.parse(read_lines(p)),), lambda m, machine: m.execute(machine)),
+    Solver('232', lambda m, p: (True,), lambda m, debug: m.run(debug)),
+    Solver('241', lambda m, p: (m.parse(_rstripped(p)),), lambda m, pieces: m.build(pieces)[1]),
+    Solver('242', lambda m, p: (m.parse(_rstripped(p)),), lambda m, pieces: m.build(pieces)),
+    Solver('251', lambda m, p: (m.Machine(m.build()), read_ints(p)[0]),
+           lambda m, machine, iterations: m.run(machine, iterations)),
+]}
+
+
+def discover(root: str=ROOT) -> List[str]:
+    """
+    Find every solver module in the repository.
+
+    :param root: the repository root containing the ``NN/`` day directories
+
+    :return: the module suffixes (``'011'``, ``'012'``, ...) in day order
+    """
+    paths = glob.glob(os.path.join(root, '[0-9][0-9]', 'main_*.py'))
+    return sorted(os.path.basename(x)[len('main_'):-len('.py')] for x in paths)
+
+
+def select(keys: List[str], patterns: List[str]) -> List[str]:
+    if len(patterns) == 0:
+        return keys
+    return [x for x in keys if any(x.startswith(y) for y in patterns)]
+
+
+def load_module(solver: Solver) -> ModuleType:
+    # as when the script is run directly, its own directory goes on the path
+    day_dir = os.path.dirname(solver.path)
+    if day_dir not in sys.path:
+        sys.path.insert(0, day_dir)
+
+    if solver.module_name in sys.modules:
+        return sys.modules[solver.module_name]
+
+    spec = importlib.util.spec_from_file_location(solver.module_name, solver.path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[solver.module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[solver.module_name]
+        raise
+    return module
+
+
+def run_solver(key: str, cache: ResultCache=None) -> Dict[str, Any]:
+    """
+    Import, parse and solve a single day/part, timing each stage.
+
+    :param key: the module suffix of the solver to run
+    :param cache: if given, a cached result for the same source and input is returned without running
+
+    :return: the solver's JSON-serialisable timing record
+    """
+    record = {
+        'key': key,
+        'day': int(key[:2]),
+        'part': int(key[2:]),
+        'import': None,
+        'parse': None,
+        'solve': None,
+        'result': None,
+        'cached': False,
+        'metrics': None,
+        'error': None
+    }  # type: Dict[str, Any]
+
+    if key not in SOLVERS:
+        record['error'] = 'No solver registered for main_{}'.format(key)
+        return record
+    solver = SOLVERS[key]
+
+    if cache is not None:
+        # the parse stages here import the shared modules too, so this module's sources count as well
+        sources = sorted(set(local_sources(solver.path)) | set(local_sources(__file__)))
+        digest = cache.digest(key, *sources, solver.input_path)
+        hit, entry = cache.get(digest)
+        if hit:
+            record['result'] = entry['value']
+            record['cached'] = True
+            return record
+
+    instrument.reset()
+    try:
+        start = time.perf_counter()
+        module = load_module(solver)
+        record['import'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        args = solver.parse(module, solver.input_path)
+        record['parse'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = solver.solve(module, *args)
+        record['solve'] = time.perf_counter() - start
+        record['result'] = result
+        if instrument.is_enabled():
+            record['metrics'] = instrument.snapshot()
+
+        if cache is not None:
+            cache.put(digest, key, result)
+    except Exception as e:
+        logger.exception('main_%s failed', key)
+        record['error'] = '{}: {}'.format(type(e).__name__, e)
+
+    return record
+
+
+def expected_times(report_path: str) -> Dict[str, float]:
+    """
+    Read the total time taken by each solver from a previous report.
+
+    :param report_path: the JSON report written by an earlier run; a missing file yields no timings
+
+    :return: the import + parse + solve time of each solver in the report, by key, leaving out
+        solvers whose result was taken from the cache and so were not timed
+    """
+    if not os.path.exists(report_path):
+        return {}
+    with open(report_path) as f:
+        report = json.load(f)
+    return {x['key']: sum(x[stage] or 0 for stage in ['import', 'parse', 'solve'])
+            for x in report['solvers'] if not x.get('cached', False)}
+
+
+def schedule(keys: List[str], expected: Dict[str, float]) -> List[str]:
+    """
+    Order solvers longest-expected-first so a pool of workers packs them greedily.
+
+    Solvers without a past timing are scheduled first, as they may well be the slowest.
+    """
+    return sorted(keys, key=lambda x: -expected.get(x, float('inf')))
+
+
+def _init_worker(instrumented: bool=False):
+    logging.basicConfig(level=logging.WARNING)
+    instrument.enable(instrumented)
+
+
+def run_parallel(keys: List[str], jobs: int, cache: ResultCache=None) -> Iterator[Dict[str, Any]]:
+    """
+    Run solvers across a process pool, yielding their timing records as they complete.
+
+    :param keys: the solvers to run, in the order they should be picked up by free workers
+    :param jobs: the number of worker processes
+    :param cache: passed on to :func:`run_solver`
+    """
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=_init_worker,
+                             initargs=(instrument.is_enabled(),)) as pool:
+        futures = [pool.submit(run_solver, x, cache) for x in keys]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(records: List[Dict[str, Any]],
+                 started: datetime.datetime,
+                 wall: float,
+                 jobs: int) -> Dict[str, Any]:
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'started': started.isoformat(),
+        'jobs': jobs,
+        'wall': wall,
+        'solvers': sorted(records, key=lambda x: x['key'])
+    }
+
+
+def format_record(record: Dict[str, Any]) -> str:
+    def fmt(secs: float) -> str:
+        return '{:>9.3f}s'.format(secs) if secs is not None else '{:>10}'.format('-')
+
+    return '{} {}/{}  import {}  parse {}  solve {}  {}{}'.format(
+        record['key'],
+        record['day'],
+        record['part'],
+        fmt(record['import']),
+        fmt(record['parse']),
+        fmt(record['solve']),
+        record['error'] if record['error'] is not None else record['result'],
+        ' (cached)' if record['cached'] else '')
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.runner', description=__doc__.split('\n\n')[0])
+    parser.add_argument('keys', nargs='*', help='days (15) or day/parts (152) to run; defaults to all')
+    parser.add_argument('--report', default='report.json', help='where to write the JSON report')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='number of solvers to run at once in a process pool (0 for one per CPU)')
+    parser.add_argument('--baseline', help='report whose timings order the pool (defaults to --report)')
+    parser.add_argument('--cache', action='store_true', help='reuse results for unchanged solvers and inputs')
+    parser.add_argument('--instrument', action='store_true', help='record hot-loop metrics in the report')
+    args = parser.parse_args(argv)
+    if args.instrument:
+        instrument.enable()
+    cache = ResultCache() if args.cache else None
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+
+    # the day modules leave logging setup to their __main__ blocks, so their trace logging stays off
+    logging.basicConfig(level=logging.WARNING)
+
+    started = datetime.datetime.now()
+    start = time.perf_counter()
+    keys = select(discover(), args.keys)
+    if jobs == 1:
+        results = (run_solver(x, cache) for x in keys)
+    else:
+        expected = expected_times(args.baseline or args.report)
+        keys = schedule(keys, expected)
+        if len(expected) > 0:
+            known = [expected[x] for x in keys if x in expected]
+            print('Expected wall-clock at least {:.3f}s over {} workers'.format(
+                max(max(known), sum(known) / jobs), jobs))
+        results = run_parallel(keys, jobs, cache)
+
+    records = []  # type: List[Dict[str, Any]]
+    for record in results:
+        print(format_record(record), flush=True)
+        records += [record]
+    wall = time.perf_counter() - start
+
+    with open(args.report, 'w') as f:
+        json.dump(build_report(records, started, wall, jobs), f, indent=2, default=str)
+    print('Wrote {} solver timings to {} ({:.3f}s)'.format(len(records), args.report, wall))
+
+    return 0 if all(x['error'] is None for x in records) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsRunner(unittest.TestCase):
+    def test_discover(self):
+        self.assertEqual(sorted(SOLVERS.keys()), discover())
+
+    def test_select(self):
+        self.assertEqual(['011', '012', '152'], select(['011', '012', '151', '152'], ['01', '152']))
+
+    def test_select_all(self):
+        self.assertEqual(['011', '012'], select(['011', '012'], []))
+
+    def test_run_solver(self):
+        record = run_solver('041')
+        self.assertIsNone(record['error'])
+        self.assertEqual((4, 1), (record['day'], record['part']))
+        self.assertIsInstance(record['result'], int)
+        for stage in ['import', 'parse', 'solve']:
+            self.assertGreaterEqual(record[stage], 0)
+
+    def test_schedule(self):
+        self.assertEqual(['031', '152', '011', '012'],
+                         schedule(['011', '012', '031', '152'], {'011': 0.5, '012': 0.1, '152': 9.0}))
+
+    def test_expected_times(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.json')
+            self.assertEqual({}, expected_times(path))
+            with open(path, 'w') as f:
+                json.dump(build_report([run_solver('011')], datetime.datetime.now(), 0.0, 1), f)
+            self.assertEqual(['011'], list(expected_times(path).keys()))
+
+    def test_expected_times_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(os.path.join(tmp, 'cache'))
+            run_solver('011', cache)
+            path = os.path.join(tmp, 'report.json')
+            with open(path, 'w') as f:
+                json.dump(build_report([run_solver('011', cache), run_solver('012')],
+                                       datetime.datetime.now(), 0.0, 1), f)
+            expected = expected_times(path)
+        self.assertEqual(['012'], list(expected.keys()))
+        self.assertEqual(['011', '012'], schedule(['012', '011'], expected))
+
+    def test_run_parallel(self):
+        records = list(run_parallel(['011', '041'], 2))
+        self.assertEqual(['011', '041'], sorted(x['key'] for x in records))
+        self.assertTrue(all(x['error'] is None for x in records))
+
+    def test_run_solver_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp)
+            first = run_solver('011', cache)
+            second = run_solver('011', cache)
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(first['result'], second['result'])
+        self.assertIsNone(second['solve'])
+
+    def test_run_solver_unregistered(self):
+        self.assertIsNotNone(run_solver('999')['error'])
+
+    def test_run_solver_instrumented(self):
+        self.assertIsNone(run_solver('011')['metrics'])
+        self.addCleanup(instrument.enable, instrument.is_enabled())
+        instrument.enable()
+        self.assertEqual({'counters': {}, 'timers': {}, 'progress': {}}, run_solver('011')['metrics'])
@@ -0,0 +1,234 @@
+"""
+Closed-form geometry of day 3's spiral memory.
+
+Cell 1 sits at the origin and the spiral runs anticlockwise, starting right and then up, with ``y``
+increasing upwards.  Ring ``k`` around the origin holds cells ``(2k - 1)^2 + 1`` to ``(2k + 1)^2``
+in four sides of ``2k`` cells: up the right, left along the top, down the left and right along the
+bottom.  The ring and the position along it give any cell's coordinates in constant time and memory,
+and :func:`index` inverts them.  :func:`dist_many` does the same arithmetic over a whole NumPy array
+of indices at once.
+
+:func:`accumulate` fills the spiral in order with values computed from the cells already filled
+around each one, by any kernel of neighboring offsets and any reduction of their values, as day 3
+part 2 does with the sum of all eight neighbors.  A cell's neighbors are all in its own ring or the
+one inside it, so only those two rings are kept and memory grows with the square root of the number
+of cells filled.
+"""
+import itertools
+from math import isqrt
+from typing import Callable, Iterator, List, Sequence, Tuple
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Offset = Tuple[int, int]
+
+NEIGHBORS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]  # type: List[Offset]
+
+
+def ring(idx: int) -> int:
+    """
+    :return: which ring around the origin the cell is in, 0 for cell 1
+    """
+    if idx < 1:
+        raise ValueError('Spiral cells start at 1, got {}'.format(idx))
+    return (isqrt(idx - 1) + 1) // 2
+
+
+def coordinate(idx: int) -> Tuple[int, int]:
+    """
+    :param idx: the cell number, from 1
+
+    :return: the ``(x, y)`` coordinates of the cell
+    """
+    k = ring(idx)
+    if k == 0:
+        return 0, 0
+    side, pos = divmod(idx - (2 * k - 1) ** 2 - 1, 2 * k)
+    return _side_coordinate(k, side, pos)
+
+
+def _side_coordinate(k: int, side: int, pos: int) -> Tuple[int, int]:
+    """
+    :return: the coordinates of the cell ``pos`` cells along ``side`` of ring ``k``
+    """
+    if side == 0:
+        return k, pos - k + 1
+    elif side == 1:
+        return k - 1 - pos, k
+    elif side == 2:
+        return -k, k - 1 - pos
+    else:
+        return pos - k + 1, -k
+
+
+def index(x: int, y: int) -> int:
+    """
+    :return: the number of the cell at ``(x, y)``
+    """
+    k = max(abs(x), abs(y))
+    if k == 0:
+        return 1
+    if x == k and y > -k:
+        side, pos = 0, y + k - 1
+    elif y == k:
+        side, pos = 1, k - 1 - x
+    elif x == -k:
+        side, pos = 2, k - 1 - y
+    else:
+        side, pos = 3, x + k - 1
+    return (2 * k - 1) ** 2 + 1 + side * 2 * k + pos
+
+
+def dist(idx: int) -> int:
+    """
+    :return: the Manhattan distance from the cell to cell 1
+    """
+    x, y = coordinate(idx)
+    return abs(x) + abs(y)
+
+
+def dist_many(indices: Sequence[int]) -> Sequence[int]:
+    """
+    :param indices: the cell numbers, from 1, as an integer array or anything NumPy can convert to one
+
+    :return: the distance of each cell to cell 1, as an ``int64`` array; a list if NumPy is not installed
+    """
+    if np is None:
+        return [dist(x) for x in indices]
+    indices = np.asarray(indices, dtype=np.int64)
+    if indices.size > 0 and indices.min() < 1:
+        raise ValueError('Spiral cells start at 1, got {}'.format(indices.min()))
+    # the integer square root of idx - 1; the float one truncates to it exactly below 2^52
+    n = indices - 1
+    root = np.sqrt(n).astype(np.int64)
+    if n.size > 0 and n.max() >= 1 << 52:
+        root -= root * root > n
+        root += (root + 1) * (root + 1) <= n
+    k = root + 1
+    k >>= 1
+    # the position along the cell's side, worked in place as the arrays are large
+    side_len = 2 * k
+    n -= (side_len - 1) ** 2
+    np.maximum(side_len, 1, out=side_len)
+    n %= side_len
+    # every side runs from distance 2k - 1 down to k at its middle and back up to 2k
+    k -= 1
+    n -= k
+    np.abs(n, out=n)
+    n += k + 1
+    n[indices == 1] = 0
+    return n
+
+
+def accumulate(kernel: Sequence[Offset]=NEIGHBORS,
+               reduce: Callable[[List[int]], int]=sum,
+               seed: int=1) -> Iterator[Tuple[int, int]]:
+    """
+    Fill the spiral with values computed from the cells filled before each one.
+
+    :param kernel: the offsets of the cells each value is computed from, each within one step of the
+        cell in both directions; offsets landing on cells not yet filled are left out
+    :param reduce: combines the values of a cell's filled kernel cells, in kernel order, into its
+        value; it is called with an empty list if none are filled yet
+    :param seed: the value of cell 1
+
+    :return: each cell number and its value, in order, forever
+    """
+    for dx, dy in kernel:
+        if max(abs(dx), abs(dy)) != 1:
+            raise ValueError('Kernel offsets must be neighboring cells, got {}'.format((dx, dy)))
+
+    # the values of the previous and current rings, from cell number start onward
+    window = [seed]  # type: List[int]
+    start = 1
+    idx = 1
+    yield (idx, seed)
+    for k in itertools.count(1):
+        # the previous ring is no longer needed once this one begins
+        if k > 1:
+            del window[:8 * (k - 2) or 1]
+            start = (2 * k - 3) ** 2 + 1
+        for side in range(4):
+            # the kernel cells' positions in the window; away from the corners of the ring, every
+            # kernel cell moves one cell on along its own ring with each step along the side
+            cells = []  # type: List[int]
+            for pos in range(2 * k):
+                if pos < 3 or pos > 2 * k - 3:
+                    x, y = _side_coordinate(k, side, pos)
+                    cells = [index(x + dx, y + dy) - start for dx, dy in kernel]
+                else:
+                    cells = [x + 1 for x in cells]
+                filled = len(window)
+                value = reduce([window[x] for x in cells if x < filled])
+                window.append(value)
+                idx += 1
+                yield (idx, value)
+
+
+class TestsSpiral(unittest.TestCase):
+    def test_ring(self):
+        self.assertEqual([0, 1, 1, 1, 1, 1, 1, 1, 1, 2], [ring(x) for x in range(1, 11)])
+        self.assertEqual([2, 3], [ring(25), ring(26)])
+
+    def test_ring_invalid(self):
+        with self.assertRaises(ValueError):
+            ring(0)
+
+    def test_coordinate(self):
+        self.assertEqual([(0, 0), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (2, -1)],
+                         [coordinate(x) for x in range(1, 11)])
+        self.assertEqual((2, -2), coordinate(25))
+
+    def test_index(self):
+        for idx in range(1, 10_000):
+            self.assertEqual(idx, index(*coordinate(idx)))
+
+    def test_dist(self):
+        self.assertEqual([0, 3, 2, 31], [dist(1), dist(12), dist(23), dist(1024)])
+
+    def test_dist_many(self):
+        indices = list(range(1, 5_000)) + [10 ** 9, (2 ** 31 - 1) ** 2, 2 ** 62]
+        self.assertEqual([dist(x) for x in indices], list(dist_many(indices)))
+        self.assertEqual([], list(dist_many([])))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_dist_many_invalid(self):
+        with self.assertRaises(ValueError):
+            dist_many(np.array([3, 0]))
+
+    def test_accumulate(self):
+        self.assertEqual([1, 1, 2, 4, 5, 10, 11, 23, 25, 26, 54, 57, 59, 122, 133, 142, 147, 304, 330, 351, 362,
+                          747, 806],
+                         [x for _, x in itertools.islice(accumulate(), 23)])
+
+    def test_accumulate_rules(self):
+        orthogonal = [(0, -1), (-1, 0), (1, 0), (0, 1)]
+        self.assertEqual([1, 1, 1, 2, 2, 3, 3, 4, 5, 5],
+                         [x for _, x in itertools.islice(accumulate(orthogonal), 10)])
+        self.assertEqual([(1, 1), (2, 2), (3, 3), (4, 4), (5, 5)],
+                         list(itertools.islice(accumulate(reduce=lambda xs: max(xs) + 1), 5)))
+        modular = accumulate(reduce=lambda xs: sum(xs) % 7)
+        self.assertEqual([1, 1, 2, 4, 5, 3, 4, 2, 4, 5, 5, 1, 3, 3],
+                         [x for _, x in itertools.islice(modular, 14)])
+
+    def test_accumulate_matches_grid(self):
+        for kernel in [NEIGHBORS, [(-1, -1), (1, -1), (1, 1)], [(0, 1), (-1, 0)]]:
+            grid = {(0, 0): 1}
+            for idx, value in itertools.islice(accumulate(kernel), 1, 2_000):
+                x, y = coordinate(idx)
+                grid[(x, y)] = sum(grid[(x + dx, y + dy)] for dx, dy in kernel if (x + dx, y + dy) in grid)
+                self.assertEqual(grid[(x, y)], value)
+
+    def test_accumulate_invalid_kernel(self):
+        for kernel in [[(0, 0)], [(2, 0)]]:
+            with self.assertRaises(ValueError):
+                next(accumulate(kernel))
+
+    def test_dist_large(self):
+        self.assertEqual(2 * 50_000, dist((2 * 50_000 + 1) ** 2))
+        self.assertEqual(10 ** 12, index(*coordinate(10 ** 12)))
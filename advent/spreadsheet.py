@@ -0,0 +1,267 @@
+"""
+Spreadsheet checksums (day 2) over sheets of millions of rows.
+
+:func:`checksum_stream` parses and reduces one row at a time from the memory-mapped input, so peak
+memory does not grow with the number of rows.  :func:`checksum_array` is the bulk path for
+rectangular sheets: it parses blocks of whole rows straight from the memory-mapped input bytes into a
+2D NumPy array, without decoding or copying them first, and takes the row-wise ``max - min``.
+
+:func:`row_quotient` is part 2's row value, found with exact integer arithmetic in close to linear
+time rather than by trying every pair of cells.
+
+:func:`checksum_sharded` splits a sheet file into byte ranges of whole rows and streams each range
+in a worker process, summing the partial checksums.
+
+Usage, from the repository root::
+
+    python -m advent.spreadsheet [--bulk | --jobs N] [--quotient] [FILE]
+"""
+import argparse
+import sys
+from typing import Callable, Iterable, List
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from advent.loader import Input, TempInputMixin, load, map_ranges
+
+
+BLOCK_SIZE = 1 << 22
+
+Row = List[int]
+
+
+def row_range(row: Row) -> int:
+    return max(row) - min(row)
+
+
+def row_quotient(row: Row) -> int:
+    """
+    Find the quotient of the row's one pair of evenly divisible cells.
+
+    The cells are sorted and, for each candidate divisor from the smallest up, the larger cells are
+    searched for a multiple: by probing each multiple up to the largest cell in a set of the cells,
+    or by testing each larger cell, whichever is fewer steps.
+
+    :return: the larger cell of the pair divided by the smaller, or 0 if no pair divides evenly
+    """
+    cells = sorted(x for x in row if x > 0)
+    present = set(cells)
+    largest = cells[-1] if len(cells) > 0 else 0
+    for i, divisor in enumerate(cells):
+        if i + 1 < len(cells) and cells[i + 1] == divisor:
+            return 1
+        if largest // divisor < len(cells) - i:
+            for multiple in range(2 * divisor, largest + 1, divisor):
+                if multiple in present:
+                    return multiple // divisor
+        else:
+            for cell in cells[i + 1:]:
+                if cell % divisor == 0:
+                    return cell // divisor
+    return 0
+
+
+def checksum_stream(lines: Iterable[str], row_value: Callable[[Row], int]=row_range) -> int:
+    """
+    :param lines: the rows of the sheet, as whitespace-separated integers; blank lines are skipped
+    :param row_value: what each row contributes to the checksum
+
+    :return: the sum of ``row_value`` over the rows
+    """
+    total = 0
+    for line in lines:
+        row = [int(x) for x in line.split()]
+        if len(row) > 0:
+            total += row_value(row)
+    return total
+
+
+# the bytes a sheet may hold, and those of them that make up its cells
+if np is not None:
+    _VALID = np.zeros(256, dtype=bool)
+    _VALID[list(b' \t\r\n-0123456789')] = True
+    _CELL = np.zeros(256, dtype=bool)
+    _CELL[list(b'-0123456789')] = True
+else:
+    _VALID = _CELL = None
+# the most digits an int64 cell can be sure to hold
+_MAX_DIGITS = 18
+
+
+def _parse_rows(block: memoryview) -> 'np.ndarray':
+    """
+    Parse whitespace-separated integers from raw bytes, one row per non-blank line.
+
+    :return: the rows as a 2D ``int64`` array, with no rows if the block holds only blank lines
+    """
+    raw = np.frombuffer(block, dtype=np.uint8)
+    if not _VALID[raw].all():
+        raise ValueError('Sheet holds something other than integers')
+
+    # each token's first byte and length
+    edges = np.flatnonzero(np.diff(_CELL[raw], prepend=False, append=False))
+    if len(edges) == 0:
+        return np.zeros((0, 0), dtype=np.int64)
+    starts = edges[0::2]
+    lengths = edges[1::2] - starts
+    # a minus sign may only lead a token, and must be followed by digits
+    negative = raw[starts] == ord('-')
+    if np.count_nonzero(raw == ord('-')) != np.count_nonzero(negative) or (lengths[negative] == 1).any():
+        raise ValueError('Sheet holds something other than integers')
+
+    # the tokens' values, a digit at a time across all tokens at once
+    digits = lengths - negative
+    if digits.max() > _MAX_DIGITS:
+        raise ValueError('Sheet cell too large')
+    first = starts + negative
+    cells = np.zeros(len(starts), dtype=np.int64)
+    for place in range(int(digits.max())):
+        more = digits > place
+        cells[more] = cells[more] * 10 + (raw[first[more] + place] - ord('0'))
+    cells[negative] *= -1
+
+    # the line of each token, to check each row has the same number of cells
+    lines = np.searchsorted(np.flatnonzero(raw == ord('\n')), starts)
+    rows = np.flatnonzero(np.diff(lines, prepend=-1, append=-1))
+    counts = np.diff(rows)
+    if (counts != counts[0]).any():
+        raise ValueError('Sheet is not rectangular: rows of {} and {} cells'.format(counts.min(), counts.max()))
+    return cells.reshape(len(counts), counts[0])
+
+
+def checksum_array(inp: Input, block_size: int=BLOCK_SIZE) -> int:
+    """
+    The row-range checksum of a rectangular sheet, parsed a block of rows at a time with NumPy.
+
+    :param inp: the sheet
+    :param block_size: the approximate number of bytes parsed at once
+
+    :return: the same as ``checksum_stream(inp.lines())``
+    """
+    cols = None
+    total = 0
+    for block in inp.blocks(block_size):
+        with block:
+            rows = _parse_rows(block)
+        if rows.size == 0:
+            continue
+        if cols is not None and rows.shape[1] != cols:
+            raise ValueError('Sheet is not rectangular: expected {} cells per row, got {}'.format(cols, rows.shape[1]))
+        cols = rows.shape[1]
+        total += int((rows.max(axis=1) - rows.min(axis=1)).sum())
+    return total
+
+
+def _checksum_range(inp: Input, start: int, end: int, row_value: Callable[[Row], int]) -> int:
+    return checksum_stream(inp.lines(start, end), row_value)
+
+
+def checksum_sharded(path: str,
+                     row_value: Callable[[Row], int]=row_range,
+                     jobs: int=0,
+                     shards: int=None) -> int:
+    """
+    Take a sheet's checksum across a process pool with :func:`advent.loader.map_ranges`, each
+    worker streaming a range of whole rows.
+
+    :param path: the sheet
+    :param row_value: what each row contributes to the checksum, e.g. :func:`row_range` or
+        :func:`row_quotient`; it must be a module-level function so it can be sent to the workers
+    :param jobs: the number of worker processes, 0 for one per CPU
+    :param shards: the number of ranges to split the sheet into
+
+    :return: the same as ``checksum_stream`` over the whole sheet
+    """
+    return sum(map_ranges(path, _checksum_range, jobs, shards, row_value))
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m advent.spreadsheet', description=__doc__.split('\n\n')[0])
+    parser.add_argument('file', nargs='?', help='the sheet; defaults to stdin')
+    parser.add_argument('--bulk', action='store_true', help='parse with NumPy; the sheet must be rectangular')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='number of processes to shard the sheet across (0 for one per CPU)')
+    parser.add_argument('--quotient', action='store_true',
+                        help="sum each row's evenly divisible quotient (part 2) rather than its range")
+    args = parser.parse_args(argv)
+    row_value = row_quotient if args.quotient else row_range
+    if args.bulk and args.quotient:
+        parser.error('--bulk only supports the range checksum')
+    if args.jobs != 1 and args.file is None:
+        parser.error('--jobs needs a file to shard')
+
+    if args.jobs != 1:
+        print(checksum_sharded(args.file, row_value, args.jobs))
+        return 0
+    with load([args.file] if args.file is not None else []) as inp:
+        if args.bulk:
+            print(checksum_array(inp))
+        else:
+            print(checksum_stream(inp.lines(), row_value))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+
+class TestsSpreadsheet(TempInputMixin, unittest.TestCase):
+    def test_checksum_stream(self):
+        self.assertEqual(18, checksum_stream(['5 1 9 5', '7 5 3', '', '2\t4\t6\t8']))
+
+    def test_checksum_stream_row_value(self):
+        self.assertEqual(11, checksum_stream(['5 1 9 5', '7 5 3', '2 4 6 8'], len))
+
+    def test_row_quotient(self):
+        self.assertEqual(4, row_quotient([5, 9, 2, 8]))
+        self.assertEqual(3, row_quotient([9, 4, 7, 3]))
+        self.assertEqual(2, row_quotient([3, 8, 6, 5]))
+        self.assertEqual(1, row_quotient([7, 3, 7]))
+        self.assertEqual(0, row_quotient([3, 5, 7]))
+        self.assertEqual(0, row_quotient([]))
+
+    def test_row_quotient_large(self):
+        self.assertEqual(3, row_quotient([10 ** 30 + 7, 3 * (10 ** 30 + 7), 10 ** 30 + 9]))
+        self.assertEqual(7, row_quotient([10 ** 6 + x for x in range(10 ** 4)] + [7 * (10 ** 6 + 123)]))
+
+    def test_checksum_stream_input(self):
+        self.assertEqual(18, checksum_stream(self._input(b'5 1 9 5\n7 5 3\n2 4 6 8\n').lines()))
+
+    def test_checksum_sharded(self):
+        path = self._path(b'5 1 9 5\n7 5 3\n2 4 6 8\n5 9 2 8\n9 4 7 3\n3 8 6 5')
+        for shards in [1, 2, 5, 100]:
+            self.assertEqual(36, checksum_sharded(path, jobs=2, shards=shards))
+            self.assertEqual(16, checksum_sharded(path, row_quotient, 2, shards))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_checksum_array(self):
+        inp = self._input(b'5 1 9 5\n7 5 3 3\n2\t4\t6\t8\n')
+        for block_size in [1, 10, BLOCK_SIZE]:
+            self.assertEqual(18, checksum_array(inp, block_size))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_checksum_array_blank_lines(self):
+        inp = self._input(b'\n5 1 9 5\n\n\n\n7 5 3 3\n\n')
+        for block_size in [1, 2, 8, 100]:
+            self.assertEqual(12, checksum_array(inp, block_size))
+        self.assertEqual(0, checksum_array(self._input(b'\n\n'), 1))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_checksum_array_values(self):
+        inp = self._input(b'-12 0 907\r\n123456789012345 -1 4\n')
+        self.assertEqual(919 + 123456789012346, checksum_array(inp))
+        for content in [b'1 2-3\n', b'1 - 3\n', b'1 2.5 3\n', b'1 1234567890123456789 3\n']:
+            with self.assertRaises(ValueError):
+                checksum_array(self._input(content))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_checksum_array_ragged(self):
+        for content in [b'5 1 9 5\n7 5 3\n2 4 6 8\n', b'1 2\n3\n4 5 6\n']:
+            inp = self._input(content)
+            for block_size in [1, BLOCK_SIZE]:
+                with self.assertRaises(ValueError):
+                    checksum_array(inp, block_size)
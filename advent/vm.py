@@ -0,0 +1,245 @@
+"""
+Register machine shared by the Duet (day 18) and coprocessor (day 23) programs.
+
+Assembly is turned into a list of ``(opcode, x, y)`` triples of ints.  Every operand is an index into
+the machine's register list: the 26 registers ``a`` to ``z`` come first, followed by one read-only
+slot per immediate value in the program, so an instruction never has to check whether an operand is
+a register or a literal.
+
+``snd`` appends to the machine's outbox and ``rcv`` takes from its inbox, stopping the machine while
+the inbox is empty; connecting one machine's outbox to another's inbox gives day 18's duet, while a
+day 18 part 1 driver instead inspects the ``rcv`` operand whenever the machine stops.
+"""
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Tuple, Union
+import unittest
+
+
+REGISTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+OPCODES = ['set', 'add', 'sub', 'mul', 'mod', 'jgz', 'jnz', 'snd', 'rcv']
+SET, ADD, SUB, MUL, MOD, JGZ, JNZ, SND, RCV = range(len(OPCODES))
+
+# each register's index in the register list
+_REGISTER_SLOTS = {name: i for i, name in enumerate(REGISTERS)}
+
+# instructions whose first operand is written to, and so must name a register
+_WRITES = {SET, ADD, SUB, MUL, MOD, RCV}
+
+# instructions taking a single operand; all others take two
+_UNARY = {SND, RCV}
+
+Operand = Union[str, int]
+Instruction = Tuple[int, int, int]
+
+
+class Program(object):
+    def __init__(self, code: List[Instruction], constants: List[int]):
+        """
+        :param code: the instructions, as ``(opcode, x, y)`` triples of register indices
+        :param constants: the immediate values, held in the registers after ``z``
+        """
+        self.code = code
+        self.constants = constants
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def _operand(self, idx: int) -> Operand:
+        if idx < len(REGISTERS):
+            return REGISTERS[idx]
+        return self.constants[idx - len(REGISTERS)]
+
+    def instructions(self) -> List[Tuple]:
+        """
+        :return: each instruction as ``(name, x)`` or ``(name, x, y)``, with registers as their names
+            and immediates as ints
+        """
+        out = []  # type: List[Tuple]
+        for op, x, y in self.code:
+            if op in (SND, RCV):
+                out += [(OPCODES[op], self._operand(x))]
+            else:
+                out += [(OPCODES[op], self._operand(x), self._operand(y))]
+        return out
+
+
+def assemble(lines: Iterable[str]) -> Program:
+    """
+    Assemble instructions into a :class:`Program`.
+
+    :param lines: one instruction per line, e.g. ``set a 1`` or ``jgz a -2``
+    """
+    code = []  # type: List[Instruction]
+    constants = []  # type: List[int]
+    slots = {}  # type: Dict[int, int]
+
+    def operand(token: str, line: str) -> int:
+        if token in _REGISTER_SLOTS:
+            return _REGISTER_SLOTS[token]
+        try:
+            val = int(token)
+        except ValueError:
+            raise ValueError('Not a register or integer: {} in: {}'.format(token, line))
+        if val not in slots:
+            slots[val] = len(REGISTERS) + len(constants)
+            constants.append(val)
+        return slots[val]
+
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 0 or parts[0] not in OPCODES:
+            raise ValueError('Unknown instruction: {}'.format(line))
+        op = OPCODES.index(parts[0])
+        arity = 1 if op in _UNARY else 2
+        if len(parts) != arity + 1:
+            raise ValueError('{} takes {} operands: {}'.format(parts[0], arity, line))
+        if op in _WRITES and parts[1] not in _REGISTER_SLOTS:
+            raise ValueError('Cannot write to {} in: {}'.format(parts[1], line))
+        code.append((op, operand(parts[1], line), operand(parts[2], line) if arity == 2 else 0))
+    return Program(code, constants)
+
+
+class Machine(object):
+    def __init__(self, program: Program, registers: Dict[str, int]=None):
+        """
+        :param program: the program to run
+        :param registers: initial register values, all others starting at zero
+        """
+        self.program = program
+        self.regs = [0] * len(REGISTERS) + program.constants
+        for name, val in (registers or {}).items():
+            self.regs[_REGISTER_SLOTS[name]] = val
+        self.pc = 0
+        self.inbox = deque()  # type: Deque[int]
+        self.outbox = deque()  # type: Deque[int]
+        self.sent = 0
+        self.muls = 0
+
+    def connect(self, other: 'Machine'):
+        """
+        Send this machine's output to another machine's inbox.
+        """
+        self.outbox = other.inbox
+
+    def get(self, name: str) -> int:
+        return self.regs[_REGISTER_SLOTS[name]]
+
+    def halted(self) -> bool:
+        return not 0 <= self.pc < len(self.program.code)
+
+    def waiting(self) -> bool:
+        """
+        :return: whether the machine is stopped on a ``rcv`` with nothing in its inbox
+        """
+        return not self.halted() and self.program.code[self.pc][0] == RCV and len(self.inbox) == 0
+
+    def pending(self) -> int:
+        """
+        :return: the value of the operand of the ``rcv`` the machine is stopped on
+        """
+        return self.regs[self.program.code[self.pc][1]]
+
+    def skip(self):
+        self.pc += 1
+
+    def run(self) -> bool:
+        """
+        Run until the program halts, or reaches a ``rcv`` with an empty inbox.
+
+        :return: whether the program halted
+        """
+        instructions = self.program.code
+        n = len(instructions)
+        regs = self.regs
+        inbox = self.inbox
+        outbox = self.outbox
+        pc = self.pc
+        sent = 0
+        muls = 0
+        while 0 <= pc < n:
+            op, x, y = instructions[pc]
+            if op == SET:
+                regs[x] = regs[y]
+            elif op == SUB:
+                regs[x] -= regs[y]
+            elif op == JNZ:
+                if regs[x] != 0:
+                    pc += regs[y]
+                    continue
+            elif op == MUL:
+                regs[x] *= regs[y]
+                muls += 1
+            elif op == ADD:
+                regs[x] += regs[y]
+            elif op == MOD:
+                regs[x] %= regs[y]
+            elif op == JGZ:
+                if regs[x] > 0:
+                    pc += regs[y]
+                    continue
+            elif op == SND:
+                outbox.append(regs[x])
+                sent += 1
+            elif len(inbox) > 0:
+                regs[x] = inbox.popleft()
+            else:
+                break
+            pc += 1
+        self.pc = pc
+        self.sent += sent
+        self.muls += muls
+        return not 0 <= pc < n
+
+    def __str__(self):
+        return 'Machine(pc={}, regs={})'.format(
+            self.pc, {name: val for name, val in zip(REGISTERS, self.regs) if val != 0})
+
+
+class TestsVM(unittest.TestCase):
+    def test_assemble(self):
+        self.assertEqual([('set', 'a', 1), ('jgz', 1, 'a'), ('snd', 'a'), ('rcv', 'b')],
+                         assemble(['set a 1', 'jgz 1 a', 'snd a', 'rcv b']).instructions())
+
+    def test_assemble_shares_constants(self):
+        self.assertEqual([1, -2], assemble(['set a 1', 'add a -2', 'mul a 1']).constants)
+
+    def test_assemble_write_to_immediate(self):
+        with self.assertRaises(ValueError):
+            assemble(['set 1 a'])
+
+    def test_assemble_unknown(self):
+        with self.assertRaises(ValueError):
+            assemble(['nop a'])
+
+    def test_assemble_malformed(self):
+        for line in ['set ab 5', 'jgz bc 1', 'add a 1.5', 'set c', 'snd a b', 'rcv', '']:
+            with self.assertRaises(ValueError, msg=line):
+                assemble([line])
+
+    def test_run(self):
+        machine = Machine(assemble(['set a 3', 'mul a a', 'sub a 2', 'mod a 4', 'add b a']), {'b': 10})
+        self.assertTrue(machine.run())
+        self.assertEqual((3, 13, 1), (machine.get('a'), machine.get('b'), machine.muls))
+
+    def test_jumps(self):
+        machine = Machine(assemble(['set i 5', 'add a 2', 'sub i 1', 'jgz i -2', 'jnz 1 2', 'set a 0']))
+        self.assertTrue(machine.run())
+        self.assertEqual(10, machine.get('a'))
+
+    def test_send_receive(self):
+        machine = Machine(assemble(['snd 7', 'rcv a', 'snd a']))
+        self.assertFalse(machine.run())
+        self.assertTrue(machine.waiting())
+        self.assertEqual([7], list(machine.outbox))
+        machine.inbox.append(9)
+        self.assertTrue(machine.run())
+        self.assertEqual(([7, 9], 2), (list(machine.outbox), machine.sent))
+
+    def test_skip(self):
+        machine = Machine(assemble(['set a 4', 'rcv a', 'add a 1']))
+        machine.run()
+        self.assertEqual(4, machine.pending())
+        machine.skip()
+        self.assertTrue(machine.run())
+        self.assertEqual(5, machine.get('a'))